@@ -1,79 +1,277 @@
 import logging
 import os
+import threading
 import time
-from typing import Dict
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
 
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
 
-from lucy_notes_manager.lib.path import canonical_path, path_has_component
+from lucy_notes_manager.lib.path import canonical_path
 from lucy_notes_manager.module_manager import ModuleManager
 
 logger = logging.getLogger(__name__)
 
 
+DispatchFn = Callable[[FileSystemEvent, str, int], None]
+
+
+@dataclass
+class _PendingEvent:
+    event: FileSystemEvent
+    dispatch: DispatchFn
+    deadline: float
+    raw_count: int = 1
+
+
+_EVENT_RANKS = {"moved": 3, "created": 2, "deleted": 1, "modified": 1, "opened": 0}
+
+
+def _event_rank(event: FileSystemEvent) -> int:
+    return _EVENT_RANKS.get(event.event_type, 0)
+
+
+class DebouncedDispatcher:
+    """
+    Collapse bursts of events per path and dispatch them from a worker thread.
+
+    Editors emit several events per save (write, chmod, rename-swap). Every
+    submit() pushes the path deadline `debounce_seconds` into the future;
+    once a path is quiet, `dispatch(event, path, raw_count)` is called once.
+
+    One dispatcher is shared by every watched directory: dispatches never
+    overlap, so modules run one at a time as they did on watchdog's thread.
+
+    - the highest-ranked event is kept: moved (it carries src_path) >
+      created > deleted/modified > opened; a lower-ranked event only pushes
+      the deadline back, so created+modified still runs the `created` hooks
+    - among events of equal rank the latest wins
+    - raw_count is how many raw events were collapsed into this dispatch
+    """
+
+    def __init__(self, debounce_seconds: float):
+        self._debounce_seconds = float(debounce_seconds)
+        self._pending: Dict[str, _PendingEvent] = {}
+        self._cond = threading.Condition()
+        # serializes the worker thread with flush() from the main thread
+        self._run_lock = threading.Lock()
+
+        self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker_thread.start()
+
+    def submit(self, event: FileSystemEvent, path: str, dispatch: DispatchFn) -> None:
+        deadline = time.monotonic() + self._debounce_seconds
+        with self._cond:
+            pending = self._pending.get(path)
+            if pending is None:
+                self._pending[path] = _PendingEvent(
+                    event=event, dispatch=dispatch, deadline=deadline
+                )
+            else:
+                if _event_rank(event) >= _event_rank(pending.event):
+                    pending.event = event
+                    pending.dispatch = dispatch
+                pending.deadline = deadline
+                pending.raw_count += 1
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """Dispatch everything pending right now (in the caller's thread)."""
+        with self._cond:
+            due = list(self._pending.items())
+            self._pending.clear()
+        self._run(due)
+
+    def _take_due(self) -> List[Tuple[str, _PendingEvent]]:
+        with self._cond:
+            while True:
+                while not self._pending:
+                    self._cond.wait()
+
+                now = time.monotonic()
+                next_deadline = min(p.deadline for p in self._pending.values())
+                if next_deadline > now:
+                    self._cond.wait(timeout=next_deadline - now)
+                    continue
+
+                due = [(path, p) for path, p in self._pending.items() if p.deadline <= now]
+                for path, _pending in due:
+                    del self._pending[path]
+                return due
+
+    def _run(self, due: List[Tuple[str, _PendingEvent]]) -> None:
+        with self._run_lock:
+            for path, pending in due:
+                try:
+                    pending.dispatch(pending.event, path, pending.raw_count)
+                except Exception:
+                    logger.exception("dispatch failed | path=%s", path)
+
+    def _worker_loop(self) -> None:
+        while True:
+            self._run(self._take_due())
+
+
 class FileHandler(FileSystemEventHandler):
+    # not cached: a symlinked directory on the path may be re-pointed
+    _abs = staticmethod(canonical_path)
+
     def __init__(
         self,
         modules: ModuleManager,
         open_cooldown_seconds: int,
+        debounce_ms: int = 0,
+        dispatcher: Optional[DebouncedDispatcher] = None,
     ):
         self._ignore_paths: Dict[str, int] = {}
+        # held only for dict updates; the debounce worker and the observer
+        # thread both touch the ignore map
+        self._ignore_lock = threading.Lock()
         self.modules = modules
 
+        # ".git" component markers for canonical (absolute) paths
+        self._git_dir_infix = os.sep + ".git" + os.sep
+        self._git_dir_suffix = os.sep + ".git"
+        self._sep_b = os.fsencode(os.sep)
+        self._git_dir_infix_b = os.fsencode(self._git_dir_infix)
+        self._git_dir_suffix_b = os.fsencode(self._git_dir_suffix)
+
         # on_opened throttle (per file)
         self._open_cooldown_seconds = float(open_cooldown_seconds)
-        self._last_open_ts: Dict[str, float] = {}
+        # insertion order == order of last accepted open, oldest first
+        self._last_open_ts: "OrderedDict[str, float]" = OrderedDict()
 
         # cleanup: every 200 opened events, remove 100 oldest entries
         self._cleanup_every_open_events = 200
         self._cleanup_remove_count = 100
         self._opened_events_seen = 0
 
-    def _process_file(self, event):
-        if event.is_directory or os.path.basename(event.src_path).startswith("."):
+        # debounce: pass the daemon-wide `dispatcher`; without one, debounce_ms
+        # > 0 gets a private one and 0 runs modules right in the observer thread
+        if dispatcher is None and debounce_ms > 0:
+            dispatcher = DebouncedDispatcher(debounce_seconds=debounce_ms / 1000.0)
+        self._dispatcher = dispatcher
+
+    def dispatch(self, event: FileSystemEvent) -> None:
+        # Cheap raw-path pre-filter before any on_* handler runs, so that
+        # dotfiles and .git churn (index.lock, objects/...) never reach the
+        # open-cooldown cache or path canonicalisation. _classify re-checks
+        # the canonical path. Like _classify, the .git test looks at dest_path
+        # for a move, so a file moved out of .git into the work tree still runs.
+        if event.is_directory:
             return
+        src_path = event.src_path
+        dest_path = event.dest_path
+        target_path = dest_path if event.event_type == "moved" else src_path
+        if isinstance(src_path, bytes):
+            # watch scheduled with a bytes path: reject on raw bytes and only
+            # decode the events that actually reach the modules
+            if src_path.startswith(b".", src_path.rfind(self._sep_b) + 1):
+                return
+            if self._git_dir_infix_b in target_path or target_path.endswith(
+                self._git_dir_suffix_b
+            ):
+                return
+            # watchdog >= 4 events are frozen dataclasses
+            event = replace(
+                event,
+                src_path=os.fsdecode(src_path),
+                dest_path=os.fsdecode(dest_path) if dest_path else "",
+            )
+        else:
+            if src_path.startswith(".", src_path.rfind(os.sep) + 1):
+                return
+            if self._git_dir_infix in target_path or target_path.endswith(self._git_dir_suffix):
+                return
+        super().dispatch(event)
+
+    def _classify(self, event: FileSystemEvent) -> Optional[str]:
+        """
+        Canonical path the modules should run on, or None to skip the event
+        (directories, dotfiles, anything inside .git).
+        """
+        if event.is_directory:
+            return None
+
+        src_path = event.src_path
+        if src_path.startswith(".", src_path.rfind(os.sep) + 1):
+            return None
+
+        file_path = self._abs(
+            event.dest_path if event.event_type == "moved" else src_path
+        )
+        if self._git_dir_infix in file_path or file_path.endswith(self._git_dir_suffix):
+            return None
+
+        return file_path
 
-        file_path = event.dest_path if event.event_type == "moved" else event.src_path
-        file_path = canonical_path(file_path)
+    def _process_file(self, event):
+        file_path = self._classify(event)
+        if file_path is None:
+            return
 
-        if path_has_component(file_path, ".git"):
+        if self._dispatcher is not None:
+            self._dispatcher.submit(event, file_path, self._dispatch)
             return
 
+        self._dispatch(event, file_path, 1)
+
+    def _consume_ignore(self, event: FileSystemEvent, file_path: str) -> bool:
         if event.event_type == "moved":
-            if self._check_and_delete_ignore(canonical_path(event.src_path)) or self._check_and_delete_ignore(
-                canonical_path(event.dest_path)
-            ):
-                return
-            logger.info(f"EVENT: Moved: {event.src_path} → {event.dest_path}")
-        else:
-            if self._check_and_delete_ignore(file_path):
-                return
-            logger.info(
-                f"EVENT: {str(event.event_type).capitalize()}: {event.src_path}"
-            )
+            return self._check_and_delete_ignore(self._abs(event.src_path), file_path)
+        return self._check_and_delete_ignore(file_path)
+
+    def _dispatch(self, event: FileSystemEvent, file_path: str, raw_count: int) -> None:
+        # each collapsed raw event consumes one ignore mark; run if any is left
+        ignored = 0
+        while ignored < raw_count and self._consume_ignore(event, file_path):
+            ignored += 1
+        if ignored == raw_count:
+            return
+
+        if logger.isEnabledFor(logging.INFO):
+            if event.event_type == "moved":
+                logger.info("EVENT: Moved: %s → %s", event.src_path, event.dest_path)
+            else:
+                logger.info(
+                    "EVENT: %s: %s", str(event.event_type).capitalize(), event.src_path
+                )
 
         ignore_paths = self.modules.run(path=file_path, event=event)
         if ignore_paths:
             self._mark_to_ignore(ignore_paths=ignore_paths)
 
-        logging.info("--- END ---\n\n")
+        logger.info("--- END ---\n\n")
 
     def _mark_to_ignore(self, ignore_paths: Dict[str, int]) -> None:
         for path, count in ignore_paths.items():
-            new_count = self._bump_ignore(path, count)
-            logger.info("MARKED TO IGNORE: %s (count=%d)", canonical_path(path), new_count)
-
-    def _check_and_delete_ignore(self, input_path: str) -> bool:
-        cur = self._ignore_paths.get(canonical_path(input_path), 0)
-        if cur <= 0:
-            return False
-
-        remaining = self._bump_ignore(input_path, -1)
-        logger.info("IGNORED: %s (remaining=%d)\n\n", canonical_path(input_path), remaining)
+            abs_path = self._abs(path)
+            new_count = self._bump_ignore(abs_path, count)
+            logger.info("MARKED TO IGNORE: %s (count=%d)", abs_path, new_count)
+
+    def _check_and_delete_ignore(self, *abs_paths: str) -> bool:
+        """
+        Consume one ignore mark from the first of `abs_paths` that has one
+        (moved events check src and dest in a single locked pass).
+        """
+        with self._ignore_lock:
+            for abs_path in abs_paths:
+                if self._ignore_paths.get(abs_path, 0) > 0:
+                    remaining = self._bump_ignore_locked(abs_path, -1)
+                    break
+            else:
+                return False
+
+        logger.info("IGNORED: %s (remaining=%d)\n\n", abs_path, remaining)
         return True
 
-    def _bump_ignore(self, path: str, delta: int) -> int:
-        abs_path = canonical_path(path)
+    def _bump_ignore(self, abs_path: str, delta: int) -> int:
+        """`abs_path` must already be canonical (see _abs)."""
+        with self._ignore_lock:
+            return self._bump_ignore_locked(abs_path, delta)
+
+    def _bump_ignore_locked(self, abs_path: str, delta: int) -> int:
         cur = self._ignore_paths.get(abs_path, 0)
         new = cur + int(delta)
 
@@ -90,9 +288,8 @@ class FileHandler(FileSystemEventHandler):
             return
 
         n = min(self._cleanup_remove_count, len(self._last_open_ts))
-        oldest = sorted(self._last_open_ts.items(), key=lambda kv: kv[1])[:n]
-        for path, _ts in oldest:
-            del self._last_open_ts[path]
+        for _ in range(n):
+            self._last_open_ts.popitem(last=False)
 
         logger.info(
             "OPEN CACHE CLEANUP: removed=%d remaining=%d",
@@ -104,7 +301,7 @@ class FileHandler(FileSystemEventHandler):
         if self._open_cooldown_seconds <= 0:
             return True
 
-        abs_path = canonical_path(file_path)
+        abs_path = self._abs(file_path)
         now = time.monotonic()
 
         self._opened_events_seen += 1
@@ -116,6 +313,7 @@ class FileHandler(FileSystemEventHandler):
             return False
 
         self._last_open_ts[abs_path] = now
+        self._last_open_ts.move_to_end(abs_path)
         return True
 
     def on_modified(self, event):
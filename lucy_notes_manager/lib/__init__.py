@@ -1,14 +1,38 @@
+import mmap
 import os
+import re
+import tempfile
+import threading
 import time
-from typing import Dict, List
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Tuple, Union
 
 from notifypy import Notify
 
+try:
+    from jeepney import DBusAddress, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+
+    _NOTIFICATIONS_ADDRESS = DBusAddress(
+        "/org/freedesktop/Notifications",
+        bus_name="org.freedesktop.Notifications",
+        interface="org.freedesktop.Notifications",
+    )
+except ImportError:  # jeepney comes with notify-py on Linux only
+    open_dbus_connection = None
+
 _NOTIFY_LAST: Dict[str, float] = {}
 _NOTIFY_MIN_INTERVAL_SEC = 10.0
 
 notifypy = Notify()
 
+# one session-bus connection for the daemon lifetime (see _dbus_notify)
+_DBUS_LOCK = threading.Lock()
+_dbus_connection = None
+# a failed connect (no session bus yet, e.g. at login) is retried after this long
+_DBUS_RETRY_SEC = 60.0
+_dbus_retry_at = 0.0
+
 
 def safe_notify(name: str, message: str) -> None:
     """
@@ -25,11 +49,56 @@ def safe_notify(name: str, message: str) -> None:
     notify(message=message)
 
 
+def _dbus_notify(message: str, title: str) -> bool:
+    """
+    Send org.freedesktop.Notifications.Notify over a reused session-bus connection.
+
+    Returns False when D-Bus can't be used; the caller falls back to notify-py
+    (which spawns notify-send per notification on most desktops).
+    """
+    global _dbus_connection, _dbus_retry_at
+
+    if open_dbus_connection is None:
+        return False
+
+    with _DBUS_LOCK:
+        if _dbus_connection is None:
+            now = time.monotonic()
+            if now < _dbus_retry_at:
+                return False
+            try:
+                _dbus_connection = open_dbus_connection(bus="SESSION")
+            except Exception:
+                _dbus_retry_at = now + _DBUS_RETRY_SEC
+                return False
+
+        msg = new_method_call(
+            _NOTIFICATIONS_ADDRESS,
+            "Notify",
+            "susssasa{sv}i",
+            ("Lucy Note Manager", 0, "", title, message, [], {}, -1),
+        )
+        try:
+            _dbus_connection.send_and_get_reply(msg, timeout=2)
+        except Exception:
+            # connection dropped (session restart?): reconnect on the next call
+            try:
+                _dbus_connection.close()
+            except Exception:
+                pass
+            _dbus_connection = None
+            return False
+
+    return True
+
+
 def notify(message: str, title: str = "Lucy Note Manager") -> None:
     """
-    Send a desktop notification via notify-py.
+    Send a desktop notification, over D-Bus when possible, else via notify-py.
     Fails silently if notify-py (or its backend) is unavailable.
     """
+    if _dbus_notify(message=message, title=title):
+        return
 
     notifypy.title = title
     notifypy.message = message
@@ -42,7 +111,8 @@ def slow_write_lines_from(
     from_line: int,
     delay: float = 0.2,
 ) -> Dict[str, int]:
-    abs_path = os.path.abspath(path)
+    # callers usually pass ctx.path, which is already absolute
+    abs_path = path if os.path.isabs(path) else os.path.abspath(path)
     from_idx = max(0, int(from_line) - 1)
 
     slow_writes = 0
@@ -52,7 +122,8 @@ def slow_write_lines_from(
         if from_idx > 0:
             f.writelines(lines[:from_idx])
 
-        # slow part
+        # slow part: flush per line on purpose - every flush is one watchdog
+        # event, and the returned count tells the daemon how many to ignore
         for line in lines[from_idx:]:
             f.write(line)
             f.flush()
@@ -61,3 +132,122 @@ def slow_write_lines_from(
 
     # if slow part was empty, file still changed -> ignore once
     return {abs_path: slow_writes or 1}
+
+
+# files smaller than this are read into the heap rather than mapped
+_MMAP_MIN_BYTES = 4 * 1024 * 1024
+
+
+@contextmanager
+def mapped_file(f: BinaryIO) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    Read-only view of an open file's bytes.
+
+    Notes are small and get edited by other programs while we look at them: a
+    mapping of a file truncated under us raises SIGBUS on access, so anything
+    below _MMAP_MIN_BYTES is just read. Only larger files are mapped, to keep
+    them off the heap. Unmapped on exit, so close the block before writing to
+    the file.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if size < _MMAP_MIN_BYTES:
+        f.seek(0)
+        yield f.read()
+        return
+
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mm
+    finally:
+        mm.close()
+
+
+# line ends as text mode sees them; args.get_args_from_file numbers lines alike
+_NEWLINE_RE = re.compile(rb"\r\n|\r|\n")
+
+
+def line_span(buf: Union[bytes, mmap.mmap], lineno_1based: int) -> Tuple[int, int]:
+    """
+    Byte offsets [start, end) of a line in `buf`; `end` includes the newline.
+
+    Out-of-range line numbers clamp to the first/last line, like indexing
+    readlines() with max(0, min(len(lines) - 1, lineno_1based - 1)).
+    Only the bytes up to that line are scanned.
+    """
+    size = len(buf)
+    start = 0
+    for _ in range(lineno_1based - 1):
+        nl = _NEWLINE_RE.search(buf, start)
+        if nl is None or nl.end() >= size:
+            break
+        start = nl.end()
+
+    nl = _NEWLINE_RE.search(buf, start)
+    return start, (size if nl is None else nl.end())
+
+
+# tails at least this big are moved by the kernel (sendfile), not via Python bytes
+_KERNEL_COPY_MIN_BYTES = 256 * 1024
+
+
+def _sendfile_all(out_fd: int, in_fd: int, offset: int, count: int) -> None:
+    while count > 0:
+        sent = os.sendfile(out_fd, in_fd, offset, count)
+        if sent == 0:
+            raise OSError("sendfile: unexpected end of file")
+        offset += sent
+        count -= sent
+
+
+def replace_span(f: BinaryIO, start: int, end: int, data: bytes) -> None:
+    """
+    Replace bytes [start, end) of an open ("r+b") file with `data`, in place.
+
+    Bytes before `start` are not touched. A large tail is parked in an
+    anonymous temp file and copied back with sendfile(), so it never passes
+    through Python; small tails are simply re-written.
+    """
+    fd = f.fileno()
+    tail_size = os.fstat(fd).st_size - end
+
+    if tail_size >= _KERNEL_COPY_MIN_BYTES and hasattr(os, "sendfile"):
+        with tempfile.TemporaryFile() as tmp:
+            try:
+                _sendfile_all(tmp.fileno(), fd, end, tail_size)
+            except OSError:
+                pass  # sendfile unsupported here: rewrite the tail from Python below
+            else:
+                f.seek(start)
+                f.write(data)
+                f.flush()
+                try:
+                    _sendfile_all(fd, tmp.fileno(), 0, tail_size)
+                except OSError:
+                    f.seek(start + len(data))
+                    tmp.seek(0)
+                    f.write(tmp.read())
+                f.truncate(start + len(data) + tail_size)
+                return
+
+    tail = os.pread(fd, tail_size, end) if tail_size > 0 else b""
+    f.flush()
+    _pwrite_chunks(fd, (data, tail), start)
+    os.ftruncate(fd, start + len(data) + len(tail))
+    f.seek(0, os.SEEK_END)
+
+
+def _pwrite_chunks(fd: int, chunks: Sequence[bytes], offset: int) -> None:
+    # one pwritev() gathers the chunks in the kernel: no joined copy in Python
+    if hasattr(os, "pwritev"):
+        written = os.pwritev(fd, chunks, offset)
+        if written == sum(map(len, chunks)):
+            return
+        rest = b"".join(chunks)[written:]  # short write: finish from a single buffer
+        offset += written
+    else:
+        rest = b"".join(chunks)
+
+    while rest:
+        written = os.pwrite(fd, rest, offset)
+        rest = rest[written:]
+        offset += written
@@ -1,9 +1,15 @@
 import argparse
 import logging
+import os
+import re
 import shlex
 import sys
+import threading
+from collections import OrderedDict, defaultdict
 from collections.abc import Iterable
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from itertools import islice, repeat
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterator, List, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +22,32 @@ Template example:
         ("--tags", str, [], "Multi-value argument),
     ]
 """
-Template = List[Tuple[str, type, Any, str]]
+Template = Sequence[Tuple[str, type, Any, str]]
 
 ArgLines = Dict[str, List[int]]
 
 
-def parse_args(args: list[str], template: Template) -> tuple[dict[str, Any], list[str]]:
+# id(template) -> (template, len(template), parser, parsed defaults)
+_PARSER_CACHE: Dict[int, Tuple[Template, int, argparse.ArgumentParser, Dict[str, Any]]] = {}
+_PARSER_CACHE_MAX_SIZE = 32
+
+
+@lru_cache(maxsize=512)
+def flag_to_dest(flag: str) -> str:
+    """
+    '--sys-notes-dirs' -> 'sys_notes_dirs' (the argparse dest / config key).
+
+    Interned: the result keys every parsed-args and config dict, and lines up
+    with the identifier-like literals modules index them with.
+    """
+    return sys.intern(flag.lstrip("-").replace("-", "_"))
+
+
+def _build_parser(template: Template) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
 
     for flag, typ, default, desc in template:
-        dest = flag.lstrip("-").replace("-", "_")
+        dest = flag_to_dest(flag)
 
         if typ is bool:
             parser.add_argument(
@@ -50,8 +72,44 @@ def parse_args(args: list[str], template: Template) -> tuple[dict[str, Any], lis
                 default=default,
             )
 
+    return parser
+
+
+def _get_parser(template: Template) -> Tuple[argparse.ArgumentParser, Dict[str, Any]]:
+    """
+    Parser for `template` and its parsed defaults, built once and reused while
+    the template is unchanged.
+
+    The cache entry keeps a reference to the template, so its id() can't be reused.
+    """
+    cached = _PARSER_CACHE.get(id(template))
+    if cached is not None and cached[0] is template and cached[1] == len(template):
+        return cached[2], cached[3]
+
+    parser = _build_parser(template)
+    defaults = vars(parser.parse_known_args([])[0])
+    if len(_PARSER_CACHE) >= _PARSER_CACHE_MAX_SIZE:
+        _PARSER_CACHE.clear()
+    _PARSER_CACHE[id(template)] = (template, len(template), parser, defaults)
+    return parser, defaults
+
+
+def parse_args(args: list[str], template: Template) -> tuple[dict[str, Any], list[str]]:
+    parser, defaults = _get_parser(template)
+
+    # Seed the namespace with the already-converted defaults: argparse then
+    # skips its per-action default pass, and vars() below hands back this
+    # namespace's own dict. The parser is shared, so list defaults are copied
+    # (callers extend them).
+    namespace = argparse.Namespace(
+        **{
+            dest: list(value) if isinstance(value, list) else value
+            for dest, value in defaults.items()
+        }
+    )
+
     try:
-        namespace, unknown_args = parser.parse_known_args(args)
+        namespace, unknown_args = parser.parse_known_args(args, namespace=namespace)
     except SystemExit:
         return {}, args
 
@@ -69,7 +127,7 @@ def get_config_args(path: str, template: Template) -> Tuple[Dict[str, Any], List
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            config_args_raw.extend(shlex.split(line))
+            config_args_raw.extend(_split_line(line))
 
     return parse_args(template=template, args=config_args_raw)
 
@@ -86,12 +144,18 @@ def merge_known_args(
     Rules:
         - None or "" in overwrite_args = "not provided", do NOT overwrite.
         - Everything else in overwrite_args overrides args.
+
+    When nothing would be overwritten, 'args' itself is returned (no copy):
+    treat the result as read-only.
     """
-    merged_args = dict(args)
-    for key, value in overwrite_args.items():
-        if value not in (None, ""):
-            merged_args[key] = value
-    return merged_args
+    overrides = {
+        key: value
+        for key, value in overwrite_args.items()
+        if value is not None and value != ""
+    }
+    if not overrides:
+        return args
+    return {**args, **overrides}
 
 
 def setup_config_and_cli_args(
@@ -111,7 +175,7 @@ def setup_config_and_cli_args(
         args=sys.argv[1:],
     )
     defaults_by_key: Dict[str, Any] = {
-        flag.lstrip("-").replace("-", "_"): default
+        flag_to_dest(flag): default
         for flag, _typ, default, _desc in template
     }
 
@@ -146,11 +210,140 @@ def setup_config_and_cli_args(
     return merged_known, merged_unknown
 
 
+FileArgs = Tuple[Dict[str, Any], List[str], ArgLines]
+
+# (path, ino, mtime_ns, ctime_ns, size, id(template), len(template), only_first_line)
+#   -> (template, parsed file args); the template is kept so its id() can't be reused
+_FILE_ARGS_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[Template, FileArgs]]" = OrderedDict()
+_FILE_ARGS_CACHE_MAX_SIZE = 1024
+_FILE_ARGS_CACHE_LOCK = threading.Lock()
+
+
+def _copy_file_args(file_args: FileArgs) -> FileArgs:
+    known, unknown, arg_lines = file_args
+    return (
+        {k: list(v) if isinstance(v, list) else v for k, v in known.items()},
+        list(unknown),
+        {k: list(v) for k, v in arg_lines.items()},
+    )
+
+
 def get_args_from_file(
     path: str,
     template: Template,
     only_first_line: bool = False,
-) -> Tuple[Dict[str, Any], List[str], ArgLines]:
+    force_reload: bool = False,
+) -> FileArgs:
+    """
+    Same as _read_args_from_file, memoized by the file's stat signature.
+
+    Unchanged files (same inode, mtime_ns, ctime_ns and size) are not re-read or
+    re-parsed.
+    Every call returns fresh containers, so callers may mutate the result.
+
+    force_reload: skip the lookup (but refresh the entry). For callers that just
+    wrote the file: mtime and ctime have coarse granularity, so a same-size
+    rewrite can keep the old signature.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        logger.info("File: %s not found.", path)
+        return {}, [], {}
+    except OSError as exc:
+        logger.debug("Skipping unreadable file: %s. Reason: %s", path, exc)
+        return {}, [], {}
+
+    key = (
+        path,
+        st.st_ino,
+        st.st_mtime_ns,
+        st.st_ctime_ns,
+        st.st_size,
+        id(template),
+        len(template),
+        only_first_line,
+    )
+
+    if not force_reload:
+        with _FILE_ARGS_CACHE_LOCK:
+            cached = _FILE_ARGS_CACHE.get(key)
+            if cached is not None and cached[0] is template:
+                _FILE_ARGS_CACHE.move_to_end(key)
+                return _copy_file_args(cached[1])
+
+    file_args = _read_args_from_file(
+        path=path, template=template, only_first_line=only_first_line
+    )
+
+    with _FILE_ARGS_CACHE_LOCK:
+        _FILE_ARGS_CACHE[key] = (template, _copy_file_args(file_args))
+        if len(_FILE_ARGS_CACHE) > _FILE_ARGS_CACHE_MAX_SIZE:
+            _FILE_ARGS_CACHE.popitem(last=False)
+
+    return file_args
+
+
+# --<letter>[letters, digits, "_", "-"], optionally followed by =value
+# (\w is str.isalnum() plus "_"; the leading letter is checked with isalpha())
+_FLAG_TOKEN_RE = re.compile(r"--\w[\w-]*(?:=|\Z)")
+
+
+@lru_cache(maxsize=512)
+def _is_valid_flag_token(token: str) -> bool:
+    return (
+        token.startswith("--")
+        and token[2:3].isalpha()
+        and _FLAG_TOKEN_RE.match(token) is not None
+    )
+
+
+# (id(template), len(template), line tokens) -> (template, known, unknown)
+_LINE_ARGS_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[Template, Dict[str, Any], List[str]]]" = OrderedDict()
+_LINE_ARGS_CACHE_MAX_SIZE = 2048
+_LINE_ARGS_CACHE_LOCK = threading.Lock()
+
+
+def _parse_line_args(
+    template: Template, tokens: Tuple[str, ...]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    parse_args for the flag tokens of one line, memoized per line.
+
+    Editing a note changes its stat signature, so the whole file is re-read;
+    its other flag lines are usually unchanged and skip argparse here.
+    Returns fresh containers (the caller extends list values).
+    """
+    key = (id(template), len(template), tokens)
+    with _LINE_ARGS_CACHE_LOCK:
+        cached = _LINE_ARGS_CACHE.get(key)
+        if cached is not None and cached[0] is template:
+            _LINE_ARGS_CACHE.move_to_end(key)
+            known, unknown = cached[1], cached[2]
+            return (
+                {k: list(v) if isinstance(v, list) else v for k, v in known.items()},
+                list(unknown),
+            )
+
+    known, unknown = parse_args(template=template, args=list(tokens))
+
+    with _LINE_ARGS_CACHE_LOCK:
+        _LINE_ARGS_CACHE[key] = (
+            template,
+            {k: list(v) if isinstance(v, list) else v for k, v in known.items()},
+            list(unknown),
+        )
+        if len(_LINE_ARGS_CACHE) > _LINE_ARGS_CACHE_MAX_SIZE:
+            _LINE_ARGS_CACHE.popitem(last=False)
+
+    return known, unknown
+
+
+def _read_args_from_file(
+    path: str,
+    template: Template,
+    only_first_line: bool = False,
+) -> FileArgs:
     """
     Reads args from file, accepting only lines that begin with a valid flag:
       --<name>   (where <name> starts with a letter)
@@ -161,86 +354,93 @@ def get_args_from_file(
       text --flag
     """
 
-    def is_valid_flag_token(token: str) -> bool:
-        if not token.startswith("--"):
-            return False
-        head = token.split("=", 1)[0]  # allow --flag=value
-        if len(head) < 3 or not head[2].isalpha():  # must start with letter
-            return False
-        for ch in head[3:]:
-            if not (ch.isalnum() or ch in ("_", "-")):
-                return False
-        return True
-
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
+        file = open(path, "rb", buffering=65536)
     except FileNotFoundError:
-        logger.info(f"File: {path} not found.")
+        logger.info("File: %s not found.", path)
         return {}, [], {}
-    except (UnicodeDecodeError, OSError) as exc:
-        logger.debug(f"Skipping unreadable/non-text file: {path}. Reason: {exc}")
+    except OSError as exc:
+        logger.debug("Skipping unreadable/non-text file: %s. Reason: %s", path, exc)
         return {}, [], {}
 
-    if not lines:
-        return {}, [], {}
+    # Stream the file: it is never held in memory as a whole, and with
+    # only_first_line nothing past the first line is read. Lines stay bytes
+    # until they may hold a flag, so prose is never decoded.
+    with file:
+        try:
+            return _parse_arg_lines(
+                path=path,
+                template=template,
+                lines=(
+                    islice(_universal_lines(file), 1)
+                    if only_first_line
+                    else _universal_lines(file)
+                ),
+            )
+        except (UnicodeDecodeError, OSError) as exc:
+            logger.debug("Skipping unreadable/non-text file: %s. Reason: %s", path, exc)
+            return {}, [], {}
+
+
+# a "\r" that ends a line of its own: binary reads only split on "\n"
+_LONE_CR_RE = re.compile(rb"(?<=\r)(?!\n)")
+
+
+def _universal_lines(lines: Iterable[bytes]) -> Iterator[bytes]:
+    # "\r\n", "\r" and "\n" all end a line, as in text mode (and Cmd._decode)
+    for line in lines:
+        if b"\r" in line:
+            yield from filter(None, _LONE_CR_RE.split(line))
+        else:
+            yield line
+
+
+# Bytes-level reject for lines that can't start with a flag: after ASCII
+# whitespace (as str.strip() sees it) comes "--", or a non-ASCII byte, which
+# may be Unicode whitespace and is left to the decoded check.
+_FLAG_LINE_PREFIX_RE = re.compile(rb"[\t\n\x0b\x0c\r\x1c-\x1f ]*(?:--|[\x80-\xff])")
+
 
+def _parse_arg_lines(path: str, template: Template, lines: Iterable[bytes]) -> FileArgs:
     merged_known: Dict[str, Any] = {}
     merged_unknown: List[str] = []
-    arg_lines: ArgLines = {"__unknown__": []}
+    arg_lines: "defaultdict[str, List[int]]" = defaultdict(list, {"__unknown__": []})
 
-    for lineno, raw_line in enumerate(lines, start=1):
-        if only_first_line and lineno > 1:
-            break
+    lineno = 0
+    for lineno, raw_bytes in enumerate(lines, start=1):
+        if _FLAG_LINE_PREFIX_RE.match(raw_bytes) is None:
+            continue
 
+        # raises UnicodeDecodeError: caller treats the file as non-text
+        raw_line = raw_bytes.decode("utf-8")
         stripped = raw_line.strip()
         if not stripped or stripped.startswith("#"):
             continue
 
         # line must start with a valid flag token
-        start = stripped.split()[0]
-        if not is_valid_flag_token(start):
+        if not _is_valid_flag_token(stripped.split(None, 1)[0]):
             continue
 
         try:
-            tokens = shlex.split(stripped, comments=False, posix=True)
+            # The first word is a flag, so every token is a flag or a value of
+            # the flag before it: the line's tokens are its cli args as they are.
+            cli_tokens = _split_line(stripped)
         except ValueError as e:
-            logger.debug(f"shlex.split failed for line {lineno} in {path}: {e}")
+            logger.debug("shlex.split failed for line %d in %s: %s", lineno, path, e)
             continue
 
-        # collect "--flag" + values until next flag
-        cli_tokens: List[str] = []
-        i = 0
-        while i < len(tokens):
-            tok = tokens[i]
-            if not is_valid_flag_token(tok):
-                i += 1
-                continue
-
-            cli_tokens.append(tok)
-            i += 1
-            while i < len(tokens):
-                nxt = tokens[i]
-                if is_valid_flag_token(nxt):
-                    break
-                cli_tokens.append(nxt)
-                i += 1
-
-        if not cli_tokens:
-            continue
-
-        line_known, line_unknown = parse_args(template=template, args=cli_tokens)
+        line_known, line_unknown = _parse_line_args(template, cli_tokens)
 
         if line_unknown:
             merged_unknown.extend(line_unknown)
-            arg_lines["__unknown__"].extend([lineno] * len(line_unknown))
+            arg_lines["__unknown__"].extend(repeat(lineno, len(line_unknown)))
 
         for key, value in line_known.items():
             if value in (None, ""):
                 continue
 
             count = len(value) if isinstance(value, list) else 1
-            arg_lines.setdefault(key, []).extend([lineno] * count)
+            arg_lines[key].extend(repeat(lineno, count))
 
             if key not in merged_known or merged_known[key] in (None, ""):
                 merged_known[key] = value
@@ -251,7 +451,90 @@ def get_args_from_file(
             else:
                 merged_known[key] = value
 
-    return merged_known, merged_unknown, arg_lines
+    if not lineno:  # empty file
+        return {}, [], {}
+
+    return merged_known, merged_unknown, dict(arg_lines)
+
+
+@lru_cache(maxsize=2048)
+def _split_line(line: str) -> Tuple[str, ...]:
+    """
+    shlex.split() for one line, skipping the pure-Python lexer unless the
+    line has backslashes (the only escapes shlex interprets here).
+
+    Memoized: the same flag lines are re-read on every event for a note.
+    """
+    if "\\" in line:
+        return tuple(shlex.split(line))
+    if '"' in line or "'" in line:
+        return _split_quoted(line)
+    return tuple(_PLAIN_WORD_RE.findall(line))
+
+
+# a shell word: unquoted runs and '...' / "..." sections glued together
+_WORD_RE = re.compile(r"""(?:[^ \t\r\n'"]+|"[^"]*"|'[^']*')+""")
+_WORD_PART_RE = re.compile(r"""[^'"]+|"([^"]*)"|'([^']*)'""")
+
+
+# shlex only splits on these four; \xa0, \x0c and friends stay inside a word
+_PLAIN_WORD_RE = re.compile(r"[^ \t\r\n]+")
+
+WordSpan = Tuple[int, int, str]  # (start, end, unquoted value)
+
+
+def _split_quoted(line: str) -> Tuple[str, ...]:
+    """
+    shlex.split() (posix) for a line with quotes but no backslashes.
+
+    Raises ValueError on an unclosed quote, like shlex.
+    """
+    return tuple(value for _start, _end, value in _quoted_word_spans(line))
+
+
+def _quoted_word_spans(line: str) -> List[WordSpan]:
+    spans: List[WordSpan] = []
+    pos = 0
+    for match in _WORD_RE.finditer(line):
+        if line[pos : match.start()].strip(" \t\r\n"):
+            raise ValueError("No closing quotation")
+        pos = match.end()
+
+        word = match.group()
+        if '"' in word or "'" in word:
+            word = "".join(
+                part.group(1) if part.group(1) is not None
+                else part.group(2) if part.group(2) is not None
+                else part.group()
+                for part in _WORD_PART_RE.finditer(word)
+            )
+        spans.append((match.start(), match.end(), word))
+
+    if line[pos:].strip(" \t\r\n"):
+        raise ValueError("No closing quotation")
+    return spans
+
+
+def _word_spans(line: str) -> List[WordSpan] | None:
+    """
+    Shell words of `line` with their positions in it, split like _split_line.
+
+    None for lines with backslashes: only shlex handles those.
+    """
+    if "\\" in line:
+        return None
+    if '"' in line or "'" in line:
+        return _quoted_word_spans(line)
+    return [(m.start(), m.end(), m.group()) for m in _PLAIN_WORD_RE.finditer(line)]
+
+
+@lru_cache(maxsize=512)
+def _looks_like_flag(token: str) -> bool:
+    if token.startswith("--") and len(token) > 2:
+        return True
+    if token.startswith("-") and len(token) > 1:
+        return not (token[1].isdigit() or token[1] == ".")
+    return False
 
 
 def delete_args_from_string(line: str, flags: Iterable[str]) -> str:
@@ -263,6 +546,7 @@ def delete_args_from_string(line: str, flags: Iterable[str]) -> str:
     - If removed flag is in form "--flag" -> removes ALL following value tokens
       until the next flag-like token (greedy).
     - Preserves trailing newline automatically.
+    - Kept text is not re-quoted: it stays as written, with its spacing.
 
     Heuristic for "flag-like token":
       --something  -> flag
@@ -270,20 +554,54 @@ def delete_args_from_string(line: str, flags: Iterable[str]) -> str:
       but NOT negative numbers like -1, -2.5
     """
 
-    def looks_like_flag(token: str) -> bool:
-        if token.startswith("--") and len(token) > 2:
-            return True
-        if token.startswith("-") and len(token) > 1:
-            return not (token[1].isdigit() or token[1] == ".")
-        return False
-
     newline = "\n" if line.endswith("\n") else ""
     raw = line[:-1] if newline else line
 
-    tokens = shlex.split(raw)
-    remove = set(flags)
+    remove, mentions = _flag_matcher(tuple(flags))
+
+    spans = _word_spans(raw)
+    if spans is None:
+        # backslashes: only shlex can split it, so re-quote what is kept
+        tokens = _split_line(raw)
+        out = [tokens[i] for i in _kept_token_indexes(tokens, remove)]
+        return (shlex.join(out) if out else "") + newline
+
+    if mentions.search(raw) is None:
+        # none of the flags is in the text: every word is kept, which the
+        # splice below would turn into exactly this
+        return raw.rstrip() + newline
+
+    kept = _kept_token_indexes([value for _start, _end, value in spans], remove)
+    if not kept:
+        return newline
+
+    # splice the kept words out of the original line: their quoting and the
+    # whitespace in front of them stay as written (leading indentation too)
+    parts = [raw[: spans[0][0]]]
+    for n, i in enumerate(kept):
+        start, end, _value = spans[i]
+        if n and i:
+            start = spans[i - 1][1]
+        parts.append(raw[start:end])
+    return "".join(parts) + newline
+
+
+@lru_cache(maxsize=128)
+def _flag_matcher(flags: Tuple[str, ...]) -> Tuple[FrozenSet[str], "re.Pattern[str]"]:
+    """
+    Flags to remove as a set, plus one compiled pattern finding any of them in
+    raw text. A line without a match needs no tokenizing at all.
+    """
+    remove = frozenset(flags)
+    if not remove:
+        return remove, re.compile(r"(?!)")
+    return remove, re.compile("|".join(map(re.escape, sorted(remove))))
+
 
-    out: list[str] = []
+def _kept_token_indexes(
+    tokens: List[str] | Tuple[str, ...], remove: AbstractSet[str]
+) -> List[int]:
+    kept: List[int] = []
     i = 0
     while i < len(tokens):
         tok = tokens[i]
@@ -299,11 +617,11 @@ def delete_args_from_string(line: str, flags: Iterable[str]) -> str:
                 continue
 
             # consume value tokens until next flag-like token
-            while i < len(tokens) and not looks_like_flag(tokens[i]):
+            while i < len(tokens) and not _looks_like_flag(tokens[i]):
                 i += 1
             continue
 
-        out.append(tok)
+        kept.append(i)
         i += 1
 
-    return (shlex.join(out) if out else "") + newline
+    return kept
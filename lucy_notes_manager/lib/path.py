@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import stat
 from typing import Optional
 
 
@@ -13,28 +14,41 @@ def canonical_path(path_value: str) -> str:
 
 
 def path_has_component(path_value: str, component: str) -> bool:
-    path_components = abs_expand_path(path_value).split(os.sep)
-    return component in path_components
+    # separator-bounded substring test: no split into a list of components
+    absolute_path = abs_expand_path(path_value)
+    bounded = os.sep + component
+    return bounded + os.sep in absolute_path or absolute_path.endswith(bounded)
 
 
 def find_parent_with(path_value: str, marker_name: str) -> Optional[str]:
     """
     Walk up from a file or directory path and return the first parent directory
-    that contains `marker_name` as a directory.
+    that contains `marker_name` as a directory or a regular file (a linked
+    worktree or a submodule has a ".git" file, not a directory).
 
     Example:
         find_parent_with("/notes/repo/docs/todo.md", ".git") -> "/notes/repo"
 
-    Returns None when no such parent exists.
+    Returns None when no such parent exists. Not cached: the walk is one stat
+    per level, and a marker created later (git init) must be seen right away.
     """
     current_path = abs_expand_path(path_value)
     if not os.path.isdir(current_path):
         current_path = os.path.dirname(current_path)
 
     while True:
-        if os.path.isdir(os.path.join(current_path, marker_name)):
+        if _has_marker(current_path, marker_name):
             return current_path
         parent_path = os.path.dirname(current_path)
         if parent_path == current_path:
             return None
         current_path = parent_path
+
+
+def _has_marker(directory_path: str, marker_name: str) -> bool:
+    # one stat, like os.path.isdir(); symlinked markers still count
+    try:
+        marker_mode = os.stat(os.path.join(directory_path, marker_name)).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISDIR(marker_mode) or stat.S_ISREG(marker_mode)
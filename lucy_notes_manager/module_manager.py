@@ -1,5 +1,7 @@
 import logging
-from typing import Dict, List
+from itertools import chain
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
 
 from watchdog.events import FileSystemEvent
 
@@ -13,90 +15,93 @@ from lucy_notes_manager.modules.abstract_module import AbstractModule, Context,
 
 logger = logging.getLogger(__name__)
 
+EVENT_TYPES = ("created", "modified", "moved", "deleted", "opened")
+
+SYS_TEMPLATE: Template = (
+    (
+        "--force",
+        str,
+        [],
+        "Force-enable modules by name even if they are excluded. "
+        "Example: --force git todo",
+    ),
+    (
+        "--exclude",
+        str,
+        [],
+        "Disable modules by name. Can be overridden per module via --force. "
+        "Example: --exclude git todo",
+    ),
+    (
+        "--sys-priority",
+        str,
+        [],
+        "Override module execution order (lower runs first). "
+        "Format: name=int. Example: --sys-priority banner=5 renamer=20 todo=30",
+    ),
+    (
+        "--sys-use_only_first_line",
+        bool,
+        False,
+        "If true, parse module arguments only from the first line of the file (faster, but ignores flags below).",
+    ),
+)
 
-class ModuleManager:
-    def __init__(self, modules: List[AbstractModule], args):
-        self.modules = modules
-        self.template: Template = [
-            (
-                "--force",
-                str,
-                [],
-                "Force-enable modules by name even if they are excluded. "
-                "Example: --force git todo",
-            ),
-            (
-                "--exclude",
-                str,
-                [],
-                "Disable modules by name. Can be overridden per module via --force. "
-                "Example: --exclude git todo",
-            ),
-            (
-                "--sys-priority",
-                str,
-                [],
-                "Override module execution order (lower runs first). "
-                "Format: name=int. Example: --sys-priority banner=5 renamer=20 todo=30",
-            ),
-            (
-                "--sys-use_only_first_line",
-                bool,
-                False,
-                "If true, parse module arguments only from the first line of the file (faster, but ignores flags below).",
-            ),
-        ]
 
-        for module in self.modules:
-            self.template.extend(module.template)
+class ModuleManager:
+    def __init__(self, modules: Sequence[AbstractModule], args):
+        # immutable: it also keys the cached argparse parser
+        self.template: Template = tuple(
+            chain(SYS_TEMPLATE, *(module.template for module in modules))
+        )
 
         self.config, _ = parse_args(args=args, template=self.template)
 
-        priority_dict = self._parse_priority_list(self.config["sys_priority"])
-        self.modules.sort(key=lambda m: priority_dict.get(m.name, m.priority))
+        # read-only once built: self.config (and so the order) never changes
+        self.priorities: Mapping[str, int] = MappingProxyType(
+            self._parse_priority_list(self.config["sys_priority"])
+        )
+        self.modules: Tuple[AbstractModule, ...] = tuple(
+            sorted(modules, key=lambda m: self.priorities.get(m.name, m.priority))
+        )
+
+        self._dispatch = self._build_dispatch_table()
 
     def run(self, path: str, event: FileSystemEvent) -> Dict[str, int] | None:
-        def _update_config():
+        def _load_context(force_reload: bool = False) -> Context:
             known_args, _, arg_lines = get_args_from_file(
                 path=path,
                 template=self.template,
                 only_first_line=self.config["sys_use_only_first_line"],
+                force_reload=force_reload,
             )
             merged_known_args = merge_known_args(
                 args=self.config, overwrite_args=known_args
             )
-            return merged_known_args, arg_lines
-
-        config, arg_lines = _update_config()
+            return Context(path=path, config=merged_known_args, arg_lines=arg_lines)
+
+        actions = self._dispatch.get(event.event_type, ())
+        if not actions:
+            return None
+
+        # both are frozen: shared by every module until a module changes the file
+        if event.event_type == "deleted":
+            # nothing left to read args from: global config only
+            ctx = Context(path=path, config=self.config, arg_lines={})
+        else:
+            ctx = _load_context()
+        system = System(
+            event=event,
+            global_template=self.template,
+            modules=self.modules,
+        )
 
         ignore_paths: Dict[str, int] = {}
 
-        for module in self.modules:
-            if (
-                module.name in self.config["exclude"]
-                and module.name not in self.config["force"]
-            ):
-                continue
-
-            if event.event_type not in module.__class__.__dict__:  # not from parent
-                continue
-
-            action = getattr(module, event.event_type)
-
-            logger.info(f"STARTING: {module.name}")
-            event_ignore = action(
-                Context(
-                    path=path,
-                    config=config,
-                    arg_lines=arg_lines,
-                ),
-                System(
-                    event=event,
-                    global_template=self.template,
-                    modules=self.modules,
-                ),
-            )
-            logger.info(f"END: {module.name}")
+        for module, action in actions:
+            logger.info("STARTING: %s", module.name)
+            event_ignore = action(ctx, system)
+            logger.info("END: %s", module.name)
 
             if event_ignore:
                 for path, times in event_ignore.items():
@@ -104,10 +109,33 @@ class ModuleManager:
                         continue
                     ignore_paths[path] = ignore_paths.get(path, 0) + int(times)
 
-                config, arg_lines = _update_config()
+                # the module wrote files: don't trust the stat-keyed args cache
+                ctx = _load_context(force_reload=True)
 
         return ignore_paths or None
 
+    def _build_dispatch_table(self) -> Dict[str, List[Tuple[AbstractModule, Callable]]]:
+        """
+        event type -> [(module, bound handler)] in execution order.
+
+        Only handlers defined on the module's own class count (not inherited
+        no-op defaults from AbstractModule). Modules disabled by --exclude
+        (and not re-enabled by --force) are left out: self.config is fixed
+        after __init__.
+        """
+        excluded = frozenset(self.config["exclude"]) - frozenset(self.config["force"])
+
+        dispatch: Dict[str, List[Tuple[AbstractModule, Callable]]] = {
+            event_type: [] for event_type in EVENT_TYPES
+        }
+        for module in self.modules:
+            if module.name in excluded:
+                continue
+            for event_type in EVENT_TYPES:
+                if event_type in module.__class__.__dict__:
+                    dispatch[event_type].append((module, getattr(module, event_type)))
+        return dispatch
+
     def _parse_priority_list(self, values: List[str]) -> Dict[str, int]:
         """
         Values example: ["banner=5", "renamer=20", "todo=30"]
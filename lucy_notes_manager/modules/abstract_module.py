@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 
 from watchdog.events import FileSystemEvent
 
@@ -11,7 +11,7 @@ from lucy_notes_manager.lib.args import Template
 IgnoreMap = Dict[str, int]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class System:
     """
     Runtime system info.
@@ -23,10 +23,10 @@ class System:
 
     event: FileSystemEvent
     global_template: Template
-    modules: List["AbstractModule"]
+    modules: Sequence["AbstractModule"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Context:
     """
     Module input for one run.
@@ -63,19 +63,19 @@ class AbstractModule(ABC):
     Template:
     - 'template': flags this module adds to the global argument template.
 
-    - example:
-        [
+    - a tuple, so subclasses can't mutate a shared default; example:
+        (
             ("--flag", type, "default value", "manual string"),
             ("--rename", str, None, "Will rename file),
             ("--banner", str, "date", "Draws ASCII banner),
             ("--tags", str, [], "Multi-value argument),
-        ]
+        )
     """
 
     name: str
     priority: int = 15
     experimental: bool = False
-    template: Template = []
+    template: Template = ()
 
     def created(self, ctx: Context, system: System) -> Optional[IgnoreMap]:
         return None
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import date
+from functools import lru_cache
 from typing import Optional
 
 import pyfiglet
 
+from lucy_notes_manager.lib import line_span, mapped_file, replace_span
 from lucy_notes_manager.lib.args import Template, delete_args_from_string
 from lucy_notes_manager.modules.abstract_module import (
     AbstractModule,
@@ -13,12 +15,26 @@ from lucy_notes_manager.modules.abstract_module import (
     System,
 )
 
+# flags stripped from a --banner line
+_BANNER_FLAGS = ("--banner",)
+
+
+@lru_cache(maxsize=1)
+def _figlet() -> pyfiglet.Figlet:
+    # pyfiglet.figlet_format() loads and parses the font file on every call
+    return pyfiglet.Figlet()
+
+
+@lru_cache(maxsize=256)
+def _figlet_text(text: str) -> str:
+    return _figlet().renderText(text)
+
 
 class Banner(AbstractModule):
     name: str = "banner"
     priority: int = 10
 
-    template: Template = [
+    template: Template = (
         (
             "--banner",
             str,
@@ -33,7 +49,7 @@ class Banner(AbstractModule):
             "Separator line inserted before the banner when the banner is placed at the top of the file. "
             "Example: --banner-separator '---' (default).",
         ),
-    ]
+    )
 
     def _apply(
         self, *, path: str, config: dict, arg_lines: dict
@@ -50,51 +66,41 @@ class Banner(AbstractModule):
 
         lineno_1based = arg_lines["banner"][0]
 
-        with open(path, "r+", encoding="utf-8") as f:
-            lines = f.readlines()
-            if not lines:
-                lines = ["\n"]
+        ascii_lines = _figlet_text(banner_text).splitlines(True)  # keep '\n'
 
-            idx = max(0, min(len(lines) - 1, lineno_1based - 1))
+        while ascii_lines and ascii_lines[0].strip() == "":
+            ascii_lines.pop(0)
 
-            ascii_lines = pyfiglet.figlet_format(banner_text).splitlines(
-                True
-            )  # keep '\n'
+        while ascii_lines and ascii_lines[-1].strip() == "":
+            ascii_lines.pop()
 
-            while ascii_lines and ascii_lines[0].strip() == "":
-                ascii_lines.pop(0)
+        if ascii_lines and not ascii_lines[-1].endswith("\n"):
+            ascii_lines[-1] += "\n"
 
-            while ascii_lines and ascii_lines[-1].strip() == "":
-                ascii_lines.pop()
-
-            if ascii_lines and not ascii_lines[-1].endswith("\n"):
-                ascii_lines[-1] += "\n"
+        if not ascii_lines:
+            return None
 
-            if not ascii_lines:
-                return None
+        with open(path, "r+b") as f:
+            # only the flag line is decoded; bytes before it are never copied or rewritten
+            with mapped_file(f) as buf:
+                start, end = line_span(buf, lineno_1based)
+                line = buf[start:end].decode("utf-8") or "\n"
 
-            if idx == 0:
-                lines[0] = delete_args_from_string(lines[0], ["--banner"])
+            if start == 0:
+                first_line = delete_args_from_string(line, _BANNER_FLAGS)
 
-                if lines[0].strip():
-                    lines.insert(1, "\n")
-                    insert_pos = 2
+                if first_line.strip():
+                    block = [first_line, "\n", sep_line, *ascii_lines]
                 else:
-                    lines[0] = "\n"
-                    insert_pos = 1
-
-                lines[insert_pos:insert_pos] = [sep_line] + ascii_lines
+                    block = ["\n", sep_line, *ascii_lines]
             else:
-                cleaned = delete_args_from_string(lines[idx], ["--banner"])
-
-                lines[idx : idx + 1] = ascii_lines
+                cleaned = delete_args_from_string(line, _BANNER_FLAGS)
 
+                block = list(ascii_lines)
                 if cleaned.strip():
-                    lines[idx + len(ascii_lines) : idx + len(ascii_lines)] = [cleaned]
+                    block.append(cleaned)
 
-            f.seek(0)
-            f.truncate()
-            f.writelines(lines)
+            replace_span(f, start, end, "".join(block).encode("utf-8"))
 
         return {path: 1}
 
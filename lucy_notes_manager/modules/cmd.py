@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import os
+import selectors
+import shutil
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple
 
+from lucy_notes_manager.lib import line_span, mapped_file
 from lucy_notes_manager.lib.args import delete_args_from_string
 from lucy_notes_manager.modules.abstract_module import (
     AbstractModule,
@@ -13,8 +20,42 @@ from lucy_notes_manager.modules.abstract_module import (
     System,
 )
 
+# upper bound on commands of one note running at the same time
+_MAX_PARALLEL_RUNS = 8
 
-@dataclass(frozen=True)
+# flags stripped from a --c line
+_CMD_FLAGS = ("--c",)
+
+# (name, PATH) -> resolved executable; only hits are kept, see _command_exists
+_WHICH_CACHE: Dict[Tuple[str, str], str] = {}
+_WHICH_CACHE_MAX = 512
+
+
+def _command_exists(name: str) -> bool:
+    """
+    Cheap PATH lookup for a bare command name, so a typo never costs a fork.
+
+    Misses are not cached: a tool installed while the daemon runs must be
+    picked up on the next save. A cached hit that has since vanished just
+    falls through to the FileNotFoundError from Popen.
+    Names with a slash are relative to the note's directory, not ours, and
+    are left to Popen.
+    """
+    if not name or os.sep in name or (os.altsep and os.altsep in name):
+        return True
+    key = (name, os.environ.get("PATH", os.defpath))
+    if key in _WHICH_CACHE:
+        return True
+    found = shutil.which(name, path=key[1])
+    if found is None:
+        return False
+    if len(_WHICH_CACHE) >= _WHICH_CACHE_MAX:
+        _WHICH_CACHE.clear()
+    _WHICH_CACHE[key] = found
+    return True
+
+
+@dataclass(frozen=True, slots=True)
 class CmdRun:
     lineno_1based: int
     cmd_tokens: List[str]
@@ -38,12 +79,14 @@ class Cmd(AbstractModule):
     - Replaces the original line containing --c with an output block.
     - Removes the --c ... part from the original line; if anything else remains on that line,
       it is kept after the block.
+    - Commands run one by one, bottom line first, so a command may rely on the
+      effects of the ones below it. --cmd-parallel runs them all at once instead.
     """
 
     name: str = "cmd"
     priority: int = 50
 
-    template = [
+    template = (
         (
             "--c",
             str,
@@ -69,7 +112,14 @@ class Cmd(AbstractModule):
             True,
             "Include stdout in the output block.",
         ),
-    ]
+        (
+            "--cmd-parallel",
+            bool,
+            False,
+            "Run a note's --c commands at the same time instead of one by one. "
+            "Only for commands that do not depend on each other.",
+        ),
+    )
 
     # Collect command runs by line using ctx.arg_lines["c"]
     def _collect_runs(self, ctx: Context) -> List[CmdRun]:
@@ -78,62 +128,176 @@ class Cmd(AbstractModule):
         if not ctx.config["c"] or not line_nums:
             return []
 
-        # Group tokens by their source line number
-        by_line: Dict[int, List[str]] = {}
-        for tok, ln in zip(ctx.config["c"], line_nums):
-            by_line.setdefault(int(ln), []).append(str(tok))
+        # Group tokens by their source line number. Tokens arrive in file
+        # order, so the stable sort is a single linear pass in practice.
+        pairs = sorted(zip(map(int, line_nums), ctx.config["c"]), key=itemgetter(0))
 
         runs: List[CmdRun] = []
-        for ln in sorted(by_line.keys()):
-            tokens = [t for t in by_line[ln] if t != ""]
+        for ln, group in groupby(pairs, key=itemgetter(0)):
+            tokens = [str(tok) for _, tok in group if tok != ""]
             if tokens:
                 runs.append(CmdRun(lineno_1based=ln, cmd_tokens=tokens))
 
         return runs
 
     # Helpers
-    def _to_str(self, x) -> str:
-        if x is None:
-            return ""
-        if isinstance(x, bytes):
-            return x.decode("utf-8", errors="replace")
-        return str(x)
-
     def _clip(self, s: str, max_bytes: int) -> str:
         if max_bytes <= 0:
             return ""
+        # A character is at most 4 bytes in UTF-8, and exactly 1 if ASCII:
+        # both cases are decided without encoding the text.
+        if len(s) <= max_bytes // 4:
+            return s
+        if s.isascii():
+            if len(s) <= max_bytes:
+                return s
+            return s[:max_bytes] + "\n…(clipped)…\n"
         b = s.encode("utf-8", errors="replace")
         if len(b) <= max_bytes:
             return s
-        return b[:max_bytes].decode("utf-8", errors="replace") + "\n…(clipped)…\n"
+        # back off to a character boundary so only the character cut in half
+        # is dropped; anything else undecodable still shows up as U+FFFD
+        cut = max_bytes
+        while cut > 0 and (b[cut] & 0xC0) == 0x80:
+            cut -= 1
+        return b[:cut].decode("utf-8", errors="replace") + "\n…(clipped)…\n"
 
     # Execute command
     def _run_cmd(
-        self, *, cmd_tokens: List[str], cwd: str, timeout: int
+        self,
+        *,
+        cmd_tokens: List[str],
+        cwd: str,
+        timeout: int,
+        max_bytes: Optional[int] = None,
     ) -> Tuple[int, str, str]:
+        """
+        Run one command; keep at most max_bytes + 1 bytes of each stream.
+
+        Output past the limit is still drained (so the child never blocks on a
+        full pipe) but dropped right away: memory stays bounded however much
+        the command prints. The extra byte lets _clip() see the overflow.
+        """
+        if not _command_exists(cmd_tokens[0]):
+            return 127, "", f"Command not found: {cmd_tokens[0]}\n"
+
+        # Keep this call on CPython's cheap spawn path: with no preexec_fn and
+        # no user/group/extra_groups, _posixsubprocess uses vfork() on Linux,
+        # so the child never copies the daemon's page tables. posix_spawn()
+        # proper is out of reach: it needs cwd=None and close_fds=False, and
+        # we run in the note's directory without leaking our fds (inotify,
+        # open notes) into the command.
         try:
-            p = subprocess.run(
+            p = subprocess.Popen(
                 cmd_tokens,
                 cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 shell=False,
+                close_fds=True,
             )
-            return p.returncode, (p.stdout or ""), (p.stderr or "")
-
         except FileNotFoundError as e:
             return 127, "", f"Command not found: {e}\n"
-
-        except subprocess.TimeoutExpired as e:
-            out = self._to_str(getattr(e, "stdout", None))
-            err = self._to_str(getattr(e, "stderr", None))
-            err = err + f"\nTIMEOUT after {timeout}s\n"
-            return 124, out, err
-
         except Exception as e:
             return 1, "", f"ERROR: {type(e).__name__}: {e}\n"
 
+        limit = None if max_bytes is None else max(0, max_bytes) + 1
+        bufs = {p.stdout: bytearray(), p.stderr: bytearray()}
+        deadline = time.monotonic() + timeout
+        timed_out = False
+
+        with p, selectors.DefaultSelector() as selector:
+            for pipe in bufs:
+                selector.register(pipe, selectors.EVENT_READ)
+
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                for key, _events in selector.select(remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        continue
+                    buf = bufs[key.fileobj]
+                    if limit is None:
+                        buf += chunk
+                    elif len(buf) < limit:
+                        buf += chunk[: limit - len(buf)]
+
+            if not timed_out:
+                try:
+                    p.wait(timeout=max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+            if timed_out:
+                p.kill()
+                p.wait()
+
+        out = self._decode(bufs[p.stdout])
+        err = self._decode(bufs[p.stderr])
+        if timed_out:
+            return 124, out, err + f"\nTIMEOUT after {timeout}s\n"
+        return p.returncode, out, err
+
+    @staticmethod
+    def _decode(data: bytearray) -> str:
+        # like subprocess text=True, minus its UnicodeDecodeError on non-UTF-8
+        # output; newlines are translated by _newlines() only after _clip(),
+        # which has to count the raw bytes to see the overflow
+        return data.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _newlines(text: str) -> str:
+        # universal newlines, as subprocess text=True would give
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    def _run_all(
+        self,
+        runs: List[CmdRun],
+        *,
+        cwd: str,
+        timeout: int,
+        max_bytes: Optional[int] = None,
+        parallel: bool = False,
+    ) -> List[Tuple[int, str, str]]:
+        """
+        Results in the order of `runs`.
+
+        By default the commands run one by one from the last to the first, the
+        order the blocks used to be written in. With `parallel` they all run at
+        once: each one mostly waits on its child process, so N runs take about
+        as long as the slowest instead of the sum.
+        """
+        if not parallel or len(runs) == 1:
+            results = [
+                self._run_cmd(
+                    cmd_tokens=run.cmd_tokens,
+                    cwd=cwd,
+                    timeout=timeout,
+                    max_bytes=max_bytes,
+                )
+                for run in reversed(runs)
+            ]
+            results.reverse()
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_RUNS, len(runs))) as executor:
+            return list(
+                executor.map(
+                    lambda run: self._run_cmd(
+                        cmd_tokens=run.cmd_tokens,
+                        cwd=cwd,
+                        timeout=timeout,
+                        max_bytes=max_bytes,
+                    ),
+                    runs,
+                )
+            )
+
     # Build output block
     def _build_block(
         self,
@@ -153,7 +317,7 @@ class Cmd(AbstractModule):
         wrote_any = False
 
         if show_stdout and stdout:
-            out.append(self._clip(stdout, max_bytes))
+            out.append(self._newlines(self._clip(stdout, max_bytes)))
             if not out[-1].endswith("\n"):
                 out.append("\n")
             wrote_any = True
@@ -161,7 +325,7 @@ class Cmd(AbstractModule):
         if show_stderr and stderr:
             if wrote_any and out[-1].strip() != "":
                 out.append("\n")
-            out.append(self._clip(stderr, max_bytes))
+            out.append(self._newlines(self._clip(stderr, max_bytes)))
             if not out[-1].endswith("\n"):
                 out.append("\n")
             wrote_any = True
@@ -179,47 +343,63 @@ class Cmd(AbstractModule):
             return None
 
         try:
-            with open(ctx.path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            f = open(ctx.path, "r+b")
         except FileNotFoundError:
             return None
 
-        if not lines:
-            lines = ["\n"]
-
-        cwd = os.path.dirname(os.path.abspath(ctx.path)) or os.getcwd()
+        with f:
+            # Decode only the --c lines; bytes before the first one are never copied
+            targets: Dict[int, Tuple[int, str, CmdRun]] = {}  # start -> (end, line, run)
+            with mapped_file(f) as buf:
+                for run in runs:
+                    start, end = line_span(buf, run.lineno_1based)
+                    line = buf[start:end].decode("utf-8") or "\n"
+                    targets.setdefault(start, (end, line, run))
 
-        # Replace from bottom to top to avoid index shifts
-        for run in sorted(runs, key=lambda r: r.lineno_1based, reverse=True):
-            idx = max(0, min(len(lines) - 1, run.lineno_1based - 1))
+                first_start = min(targets)
+                rest = buf[first_start:]
 
-            # Remove only the --c ... segment from the original line
-            cleaned = delete_args_from_string(lines[idx], ["--c"])
+            cwd = os.path.dirname(ctx.path) or os.getcwd()
 
-            _code, out_s, err_s = self._run_cmd(
-                cmd_tokens=run.cmd_tokens,
+            starts = sorted(targets)
+            results = self._run_all(
+                [targets[start][2] for start in starts],
                 cwd=cwd,
                 timeout=ctx.config["cmd_timeout"],
-            )
-
-            block = self._build_block(
-                cmd_tokens=run.cmd_tokens,
-                stdout=out_s,
-                stderr=err_s,
-                show_stdout=ctx.config["cmd_show_stdout"],
-                show_stderr=ctx.config["cmd_show_stderr"],
                 max_bytes=ctx.config["cmd_max_bytes"],
+                parallel=ctx.config["cmd_parallel"],
             )
 
-            # Replace the line with the block
-            lines[idx : idx + 1] = block
-
-            # If there is other content on that line (besides --c ...), keep it after the block
-            if cleaned.strip():
-                lines[idx + len(block) : idx + len(block)] = [cleaned]
-
-        with open(ctx.path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+            # Splice the blocks in place of their lines, from the first one on
+            out: List[bytes] = []
+            pos = 0
+            for start, (_code, out_s, err_s) in zip(starts, results):
+                end, line, run = targets[start]
+
+                # Remove only the --c ... segment from the original line
+                cleaned = delete_args_from_string(line, _CMD_FLAGS)
+
+                block = self._build_block(
+                    cmd_tokens=run.cmd_tokens,
+                    stdout=out_s,
+                    stderr=err_s,
+                    show_stdout=ctx.config["cmd_show_stdout"],
+                    show_stderr=ctx.config["cmd_show_stderr"],
+                    max_bytes=ctx.config["cmd_max_bytes"],
+                )
+
+                # If there is other content on that line (besides --c ...), keep it after the block
+                if cleaned.strip():
+                    block.append(cleaned)
+
+                out.append(rest[pos : start - first_start])
+                out.append("".join(block).encode("utf-8"))
+                pos = end - first_start
+            out.append(rest[pos:])
+
+            f.seek(first_start)
+            f.write(b"".join(out))
+            f.truncate()
 
         return {ctx.path: 1}
 
@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import logging
 import os
+import random
 import threading
 import time
 from datetime import datetime
-from queue import Queue
+from itertools import islice
 from typing import Optional
 
 from lucy_notes_manager.lib.args import Template
 from lucy_notes_manager.lib.path import (
     abs_expand_path,
+    canonical_path,
     find_parent_with,
     path_has_component,
 )
@@ -26,7 +28,6 @@ from lucy_notes_manager.modules.git.config import (
     GIT_TEMPLATE,
 )
 from lucy_notes_manager.modules.git.helpers import (
-    parse_porcelain_paths,
     push_rejected_needs_pull,
     to_str,
     union_resolve_text,
@@ -41,14 +42,19 @@ from lucy_notes_manager.modules.git.operations import (
     pick_remote,
     remote_branch_exists,
     run_git,
+    run_git_for_paths,
     safe_pull_merge,
     try_set_upstream,
 )
 from lucy_notes_manager.modules.git.types import _RepoBatch
 from lucy_notes_manager.modules.git.worker import (
+    add_event_to_batch,
     collect_due_periodic_pull_events,
+    commit_changes,
     enqueue,
+    hinted_paths_all_ignored,
     process_batch,
+    seconds_until_next_due,
     update_periodic_pull_state,
     worker_loop,
 )
@@ -66,12 +72,12 @@ class Git(AbstractModule):
     template: Template = GIT_TEMPLATE
 
     _to_str = staticmethod(to_str)
-    _parse_porcelain_paths = staticmethod(parse_porcelain_paths)
     _push_rejected_needs_pull = staticmethod(push_rejected_needs_pull)
     _union_resolve_text = staticmethod(union_resolve_text)
 
     _git_environment = git_environment
     _run_git = run_git
+    _run_git_for_paths = run_git_for_paths
     _has_upstream = has_upstream
     _current_branch = current_branch
     _pick_remote = pick_remote
@@ -84,15 +90,23 @@ class Git(AbstractModule):
 
     _enqueue = enqueue
     _worker_loop = worker_loop
+    _add_event_to_batch = add_event_to_batch
+    _seconds_until_next_due = seconds_until_next_due
     _process_batch = process_batch
+    _commit_changes = commit_changes
+    _hinted_paths_all_ignored = hinted_paths_all_ignored
     _update_periodic_pull_state = update_periodic_pull_state
     _collect_due_periodic_pull_events = collect_due_periodic_pull_events
 
     def __init__(self) -> None:
         super().__init__()
-        self._event_queue: Queue[tuple[str, str, list[str], dict, bool]] = Queue()
+        # filled by _enqueue, drained by the worker thread
         self._pending_batches: dict[str, _RepoBatch] = {}
         self._pending_lock = threading.Lock()
+        self._pending_cv = threading.Condition(self._pending_lock)
+
+        # when each repo's commit phase last left nothing uncommitted
+        self._last_clean_at: dict[str, float] = {}
 
         self._push_next_allowed_at: dict[str, float] = {}
         self._push_backoff_seconds: dict[str, float] = {}
@@ -112,15 +126,14 @@ class Git(AbstractModule):
     def _build_commit_message(self, batch: _RepoBatch, changed_paths: list[str]) -> str:
         event_summary = "+".join(sorted(batch.event_types)) if batch.event_types else "change"
 
-        file_names = [os.path.basename(path_item) for path_item in changed_paths if path_item]
-        if not file_names and batch.hinted_paths:
-            file_names = [
-                os.path.basename(path_item) for path_item in sorted(batch.hinted_paths)
-            ]
+        # only the first 8 names are rendered; the rest are just counted
+        source_paths = [path_item for path_item in changed_paths if path_item]
+        if not source_paths and batch.hinted_paths:
+            source_paths = sorted(batch.hinted_paths)
 
-        shown_names = ", ".join(file_names[:8])
-        if len(file_names) > 8:
-            shown_names += f", +{len(file_names) - 8} more"
+        shown_names = ", ".join(map(os.path.basename, islice(source_paths, 8)))
+        if len(source_paths) > 8:
+            shown_names += f", +{len(source_paths) - 8} more"
 
         message_text = f"{batch.base_message}: {event_summary}"
         if shown_names:
@@ -153,8 +166,13 @@ class Git(AbstractModule):
         self, repo_root: str, backoff_start_seconds: float, backoff_max_seconds: float
     ) -> None:
         current_backoff = self._push_backoff_seconds.get(repo_root, backoff_start_seconds)
+        # decorrelated jitter: repos that failed together (network outage)
+        # don't all retry at the same moment
         new_backoff = min(
-            max(current_backoff, backoff_start_seconds) * 2.0,
+            random.uniform(
+                backoff_start_seconds,
+                max(current_backoff, backoff_start_seconds) * 3.0,
+            ),
             backoff_max_seconds,
         )
         self._push_backoff_seconds[repo_root] = new_backoff
@@ -208,9 +226,11 @@ class Git(AbstractModule):
             else ""
         )
 
-        source_path = abs_expand_path(source_path_raw) if source_path_raw else ""
+        # canonical, like ctx.path and the repo root: a move through a
+        # symlinked directory must still land under the repo prefix
+        source_path = canonical_path(source_path_raw) if source_path_raw else ""
         destination_path = (
-            abs_expand_path(destination_path_value) if destination_path_value else ""
+            canonical_path(destination_path_value) if destination_path_value else ""
         )
 
         if (source_path and path_has_component(source_path, ".git")) or (
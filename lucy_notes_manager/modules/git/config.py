@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from lucy_notes_manager.lib.args import Template
+from lucy_notes_manager.lib.args import Template, flag_to_dest
 
 DEFAULT_COMMIT_MESSAGE: str = "Auto-commit"
 DEFAULT_TIMESTAMP_FORMAT: str = "%Y-%m-%d_%H-%M-%S"
 DEFAULT_MAX_BATCH_SECONDS: float = 8.0
 
-GIT_TEMPLATE: Template = [
+GIT_TEMPLATE: Template = (
     (
         "--git-msg",
         str,
@@ -112,4 +112,9 @@ GIT_TEMPLATE: Template = [
         120.0,
         "Maximum backoff (seconds) cap for repeated push failures.",
     ),
-]
+)
+
+# the only config keys the git worker reads; event snapshots keep just these
+GIT_CONFIG_KEYS: tuple[str, ...] = tuple(
+    flag_to_dest(flag) for flag, _typ, _default, _desc in GIT_TEMPLATE
+)
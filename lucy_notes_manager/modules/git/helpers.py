@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional
+import os
+import re
+from typing import Dict, Optional
 
 from lucy_notes_manager.modules.git.types import PathLike
 
@@ -11,33 +13,160 @@ def to_str(path_value: PathLike) -> str:
     return path_value
 
 
-def parse_porcelain_paths(porcelain_text: str) -> list[str]:
-    result_paths: list[str] = []
-    for line_text in (porcelain_text or "").splitlines():
-        trimmed_line = line_text.rstrip("\n")
-        if len(trimmed_line) < 4:
+# push output meaning "pull first"; "rejected" also covers "updates were rejected"
+_PUSH_REJECTED_RE = re.compile(
+    r"non-fast-forward|fetch first|failed to push some refs|remote contains work|rejected",
+    re.IGNORECASE,
+)
+
+
+def _read_first_line(file_path: str) -> Optional[str]:
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="surrogateescape") as file_obj:
+            return file_obj.readline().strip()
+    except OSError:
+        return None
+
+
+def resolve_git_dir(repo_root: str) -> str:
+    """
+    Git directory of the checkout at `repo_root`: `.git` itself, or the
+    directory a `.git` file points to (linked worktrees, submodules).
+    """
+    dot_git_path = os.path.join(repo_root, ".git")
+    if not os.path.isfile(dot_git_path):
+        return dot_git_path
+    first_line = _read_first_line(dot_git_path)
+    if not first_line or not first_line.startswith("gitdir:"):
+        return dot_git_path
+    return os.path.normpath(os.path.join(repo_root, first_line[len("gitdir:") :].strip()))
+
+
+# any of these lets git read config from somewhere upstream_absent() does not look
+_CONFIG_OVERRIDE_VARIABLES = (
+    "GIT_DIR",
+    "GIT_COMMON_DIR",
+    "GIT_CONFIG",
+    "GIT_CONFIG_GLOBAL",
+    "GIT_CONFIG_SYSTEM",
+    "GIT_CONFIG_COUNT",
+    "GIT_CONFIG_PARAMETERS",
+)
+_CONFIG_SECTION_HEADER_RE = re.compile(r"^[ \t]*\[([^\]\n]*)", re.MULTILINE)
+
+
+def upstream_absent(repo_root: str, environment: Dict[str, str]) -> bool:
+    """
+    True when no config file git reads can give the checked-out branch an
+    upstream: no `[branch ...]` section naming it and no `[include]` /
+    `[includeIf]` anywhere. False means "maybe": ask git, which applies the
+    real config rules and checks that the remote-tracking ref exists.
+
+    The system config is only looked for at /etc/gitconfig.
+    """
+    if any(name in environment for name in _CONFIG_OVERRIDE_VARIABLES):
+        return False
+
+    git_dir = resolve_git_dir(repo_root)
+    head = _read_first_line(os.path.join(git_dir, "HEAD"))
+    if not head or not head.startswith("ref: refs/heads/"):
+        return False
+    branch_name = head[len("ref: refs/heads/") :].lower()
+
+    common_dir = git_dir
+    common_dir_ref = _read_first_line(os.path.join(git_dir, "commondir"))
+    if common_dir_ref:
+        common_dir = os.path.normpath(os.path.join(git_dir, common_dir_ref))
+
+    home = environment.get("HOME") or os.path.expanduser("~")
+    xdg_config_home = environment.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    config_paths = (
+        "/etc/gitconfig",
+        os.path.join(xdg_config_home, "git", "config"),
+        os.path.join(home, ".gitconfig"),
+        os.path.join(common_dir, "config"),
+        os.path.join(git_dir, "config.worktree"),
+    )
+    for config_path in config_paths:
+        try:
+            with open(config_path, "r", encoding="utf-8", errors="surrogateescape") as file_obj:
+                config_text = file_obj.read()
+        except FileNotFoundError:
             continue
-        path_part = trimmed_line[3:]
-        if " -> " in path_part:
-            path_part = path_part.split(" -> ", 1)[1]
-        result_paths.append(path_part)
-    return result_paths
+        except OSError:
+            return False
+
+        for match in _CONFIG_SECTION_HEADER_RE.finditer(config_text):
+            # headers are compared loosely: a false "maybe" only costs a git run
+            header = match.group(1).strip().lower()
+            if header.startswith("include"):
+                return False
+            if header.startswith("branch") and branch_name in header:
+                return False
+    return True
 
 
 def push_rejected_needs_pull(output_text: str) -> bool:
-    output_lower = (output_text or "").lower()
-    indicators = [
-        "non-fast-forward",
-        "fetch first",
-        "failed to push some refs",
-        "remote contains work",
-        "updates were rejected",
-        "rejected",
-    ]
-    return any(indicator in output_lower for indicator in indicators)
+    return _PUSH_REJECTED_RE.search(output_text or "") is not None
+
+
+# conflict markers at the start of a line
+_CONFLICT_OURS_RE = re.compile(r"^<<<<<<< ", re.MULTILINE)
+_CONFLICT_SEPARATOR_RE = re.compile(r"^=======", re.MULTILINE)
+_CONFLICT_THEIRS_RE = re.compile(r"^>>>>>>> ", re.MULTILINE)
+# line breaks str.splitlines() honours but a MULTILINE "^" does not
+_OTHER_LINE_BREAK_RE = re.compile("\r(?!\n)|[\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
 
 
 def union_resolve_text(file_content: str) -> Optional[str]:
+    """
+    Keep both sides of every conflict ("ours" then "theirs"), dropping the
+    markers. None when there is no conflict or a conflict is not closed.
+    """
+    if "<<<<<<< " not in file_content:
+        return None
+    if _OTHER_LINE_BREAK_RE.search(file_content):
+        return _union_resolve_lines(file_content)
+
+    resolved_parts: list[str] = []
+    position = 0
+    saw_markers = False
+
+    while True:
+        ours_marker = _CONFLICT_OURS_RE.search(file_content, position)
+        if ours_marker is None:
+            break
+        saw_markers = True
+        resolved_parts.append(file_content[position : ours_marker.start()])
+
+        ours_start = _next_line_start(file_content, ours_marker.start())
+        separator = _CONFLICT_SEPARATOR_RE.search(file_content, ours_start)
+        if separator is None:
+            return None
+
+        theirs_start = _next_line_start(file_content, separator.start())
+        theirs_marker = _CONFLICT_THEIRS_RE.search(file_content, theirs_start)
+        if theirs_marker is None:
+            return None
+
+        # every line before a marker ends with "\n", so the sides join cleanly
+        resolved_parts.append(file_content[ours_start : separator.start()])
+        resolved_parts.append(file_content[theirs_start : theirs_marker.start()])
+        position = _next_line_start(file_content, theirs_marker.start())
+
+    if not saw_markers:
+        return None
+    resolved_parts.append(file_content[position:])
+    return "".join(resolved_parts)
+
+
+def _next_line_start(text: str, position: int) -> int:
+    newline_index = text.find("\n", position)
+    return len(text) if newline_index == -1 else newline_index + 1
+
+
+def _union_resolve_lines(file_content: str) -> Optional[str]:
+    # line by line, for text with line breaks other than \n and \r\n
     lines = file_content.splitlines(keepends=True)
     resolved_lines: list[str] = []
     line_index = 0
@@ -3,19 +3,30 @@ from __future__ import annotations
 import logging
 import os
 import subprocess
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Literal, Optional
 
 from lucy_notes_manager.lib import safe_notify
 from lucy_notes_manager.lib.path import abs_expand_path
+from lucy_notes_manager.modules.git.helpers import resolve_git_dir, upstream_absent
 
 logger = logging.getLogger(__name__)
 
 
 def git_environment(self, config: dict) -> Dict[str, str]:
+    """
+    Environment for git subprocesses. Built once per --git-key value and
+    shared between batches: treat the returned dict as read-only.
+    """
+    return _environment_for_key(config["git_key"].strip())
+
+
+@lru_cache(maxsize=16)
+def _environment_for_key(key_path_raw: str) -> Dict[str, str]:
+    # the daemon never changes os.environ, so the copy can't go stale
     environment = os.environ.copy()
     environment["GIT_TERMINAL_PROMPT"] = "0"
 
-    key_path_raw = config["git_key"].strip()
     if not key_path_raw:
         return environment
 
@@ -35,13 +46,18 @@ def run_git(
     arguments: list[str],
     environment: Dict[str, str],
     timeout_seconds: float,
+    capture: Literal["both", "stderr", "none"] = "both",
 ) -> subprocess.CompletedProcess[str]:
+    """
+    Run git in `repo_root`. `capture` picks the streams that are piped back:
+    the others go to /dev/null and come back as None on the result.
+    """
     return subprocess.run(
         ["git"] + arguments,
         cwd=repo_root,
         env=environment,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        stdout=subprocess.PIPE if capture == "both" else subprocess.DEVNULL,
+        stderr=subprocess.PIPE if capture != "none" else subprocess.DEVNULL,
         text=True,
         check=False,
         timeout=timeout_seconds,
@@ -51,6 +67,9 @@ def run_git(
 def has_upstream(
     self, repo_root: str, environment: Dict[str, str], timeout_seconds: float
 ) -> bool:
+    # no branch section anywhere in the config files: skip the git run
+    if upstream_absent(repo_root, environment):
+        return False
     result = self._run_git(
         repo_root,
         ["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"],
@@ -135,13 +154,9 @@ def try_set_upstream(
 def merge_in_progress(
     self, repo_root: str, environment: Dict[str, str], timeout_seconds: float
 ) -> bool:
-    result = self._run_git(
-        repo_root,
-        ["rev-parse", "-q", "--verify", "MERGE_HEAD"],
-        environment,
-        timeout_seconds,
-    )
-    return result.returncode == 0 and bool((result.stdout or "").strip())
+    # git itself treats an existing MERGE_HEAD file as "merging": check it
+    # directly instead of spawning `git rev-parse --verify MERGE_HEAD`
+    return os.path.isfile(os.path.join(resolve_git_dir(repo_root), "MERGE_HEAD"))
 
 
 def conflicted_files(
@@ -162,6 +177,57 @@ def conflicted_files(
     ]
 
 
+def run_git_for_paths(
+    self,
+    repo_root: str,
+    arguments: list[str],
+    paths: list[str],
+    environment: Dict[str, str],
+    timeout_seconds: float,
+    capture: Literal["both", "stderr", "none"] = "both",
+) -> subprocess.CompletedProcess[str]:
+    """
+    `git <arguments> -- <paths...>` with as few runs as the argv limit allows.
+    Returns the first failed run, or the last one when all succeed.
+    """
+    if not paths:
+        raise ValueError("run_git_for_paths needs at least one path")
+
+    result: Optional[subprocess.CompletedProcess[str]] = None
+    for path_chunk in _pathspec_chunks(paths):
+        result = self._run_git(
+            repo_root,
+            arguments + ["--"] + path_chunk,
+            environment,
+            timeout_seconds,
+            capture=capture,
+        )
+        if result.returncode != 0:
+            return result
+    return result
+
+
+# argv bytes per git run; far below ARG_MAX on Linux (2 MiB) and macOS (1 MiB),
+# leaving room for the environment
+_MAX_PATHSPEC_BYTES = 64 * 1024
+
+
+def _pathspec_chunks(paths: list[str]) -> list[list[str]]:
+    chunks: list[list[str]] = []
+    current_chunk: list[str] = []
+    current_bytes = 0
+    for path_item in paths:
+        path_bytes = len(os.fsencode(path_item)) + 1
+        if current_chunk and current_bytes + path_bytes > _MAX_PATHSPEC_BYTES:
+            chunks.append(current_chunk)
+            current_chunk, current_bytes = [], 0
+        current_chunk.append(path_item)
+        current_bytes += path_bytes
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
 def auto_resolve_merge_conflicts(
     self,
     repo_root: str,
@@ -177,82 +243,47 @@ def auto_resolve_merge_conflicts(
     if not conflicted_paths or normalized_mode == "none":
         return False
 
-    for relative_path in conflicted_paths:
-        absolute_path = os.path.join(repo_root, relative_path)
-
-        if normalized_mode in {"ours", "theirs"}:
-            side_argument = "--ours" if normalized_mode == "ours" else "--theirs"
-            checkout_result = self._run_git(
+    if normalized_mode in {"ours", "theirs"}:
+        side_argument = "--ours" if normalized_mode == "ours" else "--theirs"
+        checkout_result = self._run_git_for_paths(
+            repo_root,
+            ["checkout", side_argument],
+            conflicted_paths,
+            environment,
+            timeout_seconds,
+            capture="stderr",
+        )
+        if checkout_result.returncode != 0:
+            logger.error(
+                "auto-resolve checkout failed | repo=%s | files=%d | mode=%s | err=%s",
                 repo_root,
-                ["checkout", side_argument, "--", relative_path],
-                environment,
-                timeout_seconds,
+                len(conflicted_paths),
+                normalized_mode,
+                (checkout_result.stderr or checkout_result.stdout or "")[:1200],
             )
-            if checkout_result.returncode != 0:
-                logger.error(
-                    "auto-resolve checkout failed | repo=%s | file=%s | mode=%s | err=%s",
-                    repo_root,
-                    relative_path,
-                    normalized_mode,
-                    (checkout_result.stderr or checkout_result.stdout or "")[:1200],
-                )
-                return False
+            return False
 
-        elif normalized_mode == "union":
+    elif normalized_mode == "union":
+        # files without a clean union take our side, in one checkout
+        checkout_ours_paths: list[str] = []
+        for relative_path in conflicted_paths:
+            absolute_path = os.path.join(repo_root, relative_path)
             try:
-                if os.path.isfile(absolute_path):
-                    with open(
-                        absolute_path,
-                        "r",
-                        encoding="utf-8",
-                        errors="surrogateescape",
-                    ) as file_obj:
-                        file_text = file_obj.read()
+                if not os.path.isfile(absolute_path):
+                    checkout_ours_paths.append(relative_path)
+                    continue
+
+                # binary: line endings stay as git wrote them (no newline
+                # translation), and the file is opened once for read + rewrite
+                with open(absolute_path, "r+b") as file_obj:
+                    file_text = file_obj.read().decode("utf-8", "surrogateescape")
                     resolved_text = self._union_resolve_text(file_text)
-                    if resolved_text is None:
-                        checkout_result = self._run_git(
-                            repo_root,
-                            ["checkout", "--ours", "--", relative_path],
-                            environment,
-                            timeout_seconds,
-                        )
-                        if checkout_result.returncode != 0:
-                            logger.error(
-                                "auto-resolve union fallback checkout failed | repo=%s | file=%s | err=%s",
-                                repo_root,
-                                relative_path,
-                                (
-                                    checkout_result.stderr
-                                    or checkout_result.stdout
-                                    or ""
-                                )[:1200],
-                            )
-                            return False
-                    else:
-                        with open(
-                            absolute_path,
-                            "w",
-                            encoding="utf-8",
-                            errors="surrogateescape",
-                        ) as file_obj:
-                            file_obj.write(resolved_text)
-                else:
-                    checkout_result = self._run_git(
-                        repo_root,
-                        ["checkout", "--ours", "--", relative_path],
-                        environment,
-                        timeout_seconds,
-                    )
-                    if checkout_result.returncode != 0:
-                        logger.error(
-                            "auto-resolve union non-file checkout failed | repo=%s | path=%s | err=%s",
-                            repo_root,
-                            relative_path,
-                            (
-                                checkout_result.stderr or checkout_result.stdout or ""
-                            )[:1200],
-                        )
-                        return False
+                    if resolved_text is not None:
+                        file_obj.seek(0)
+                        file_obj.write(resolved_text.encode("utf-8", "surrogateescape"))
+                        file_obj.truncate()
+                if resolved_text is None:
+                    checkout_ours_paths.append(relative_path)
             except OSError:
                 logger.exception(
                     "auto-resolve union IO failed | repo=%s | file=%s",
@@ -261,17 +292,40 @@ def auto_resolve_merge_conflicts(
                 )
                 return False
 
-        add_result = self._run_git(
-            repo_root, ["add", "--", relative_path], environment, timeout_seconds
-        )
-        if add_result.returncode != 0:
-            logger.error(
-                "auto-resolve git add failed | repo=%s | file=%s | err=%s",
+        if checkout_ours_paths:
+            checkout_result = self._run_git_for_paths(
                 repo_root,
-                relative_path,
-                (add_result.stderr or add_result.stdout or "")[:1200],
+                ["checkout", "--ours"],
+                checkout_ours_paths,
+                environment,
+                timeout_seconds,
+                capture="stderr",
             )
-            return False
+            if checkout_result.returncode != 0:
+                logger.error(
+                    "auto-resolve union fallback checkout failed | repo=%s | files=%d | err=%s",
+                    repo_root,
+                    len(checkout_ours_paths),
+                    (checkout_result.stderr or checkout_result.stdout or "")[:1200],
+                )
+                return False
+
+    add_result = self._run_git_for_paths(
+        repo_root,
+        ["add"],
+        conflicted_paths,
+        environment,
+        timeout_seconds,
+        capture="stderr",
+    )
+    if add_result.returncode != 0:
+        logger.error(
+            "auto-resolve git add failed | repo=%s | files=%d | err=%s",
+            repo_root,
+            len(conflicted_paths),
+            (add_result.stderr or add_result.stdout or "")[:1200],
+        )
+        return False
 
     commit_result = self._run_git(
         repo_root, ["commit", "--no-edit"], environment, timeout_seconds
@@ -379,6 +433,7 @@ def safe_pull_merge(
                 ["merge", "--abort"],
                 environment,
                 timeout_seconds=operation_timeout_seconds,
+                capture="none",
             )
             pull_error = (pull_result.stderr or pull_result.stdout or "git pull failed").strip()
             logger.error(
@@ -442,6 +497,7 @@ def safe_pull_merge(
             ["merge", "--abort"],
             environment,
             timeout_seconds=operation_timeout_seconds,
+            capture="none",
         )
         pull_error = (pull_result.stderr or pull_result.stdout or "git pull failed").strip()
         logger.error(
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import logging
+import os
 import subprocess
 import time
-from queue import Empty
 
 from lucy_notes_manager.lib import safe_notify
+from lucy_notes_manager.lib.path import path_has_component
+from lucy_notes_manager.modules.git.config import GIT_CONFIG_KEYS
 from lucy_notes_manager.modules.git.types import _RepoBatch
 
 logger = logging.getLogger(__name__)
 _PULL_ONLY_EVENT_TYPES = {"opened", "scheduled_pull"}
 
+# a batch whose hinted paths are all .gitignored skips add/commit when the
+# repo was found clean this recently
+_RECENTLY_CLEAN_SECONDS = 5.0
+# larger batches are not worth a check-ignore round trip
+_MAX_IGNORE_CHECK_PATHS = 256
+
 
 def should_force_flush_batch(batch: _RepoBatch, now_timestamp: float) -> bool:
     if batch.max_batch_seconds <= 0.0:
@@ -22,6 +30,20 @@ def should_force_flush_batch(batch: _RepoBatch, now_timestamp: float) -> bool:
     return (now_timestamp - batch.first_event_at) >= batch.max_batch_seconds
 
 
+def batch_has_worktree_paths(batch: _RepoBatch) -> bool:
+    """
+    False only when every hinted path is inside .git or outside the repo.
+    A batch without hints is treated as touching the work tree.
+    """
+    if not batch.hinted_paths:
+        return True
+    repo_prefix = batch.repo_root.rstrip(os.sep) + os.sep
+    return any(
+        path_item.startswith(repo_prefix) and not path_has_component(path_item, ".git")
+        for path_item in batch.hinted_paths
+    )
+
+
 def update_periodic_pull_state(
     self, repo_root: str, config_snapshot: dict, now_timestamp: float
 ) -> None:
@@ -72,163 +94,193 @@ def enqueue(
     config_snapshot: dict,
     wants_pull: bool,
 ) -> None:
-    self._event_queue.put((repo_root, event_type, paths, dict(config_snapshot), wants_pull))
+    """Merge an event straight into its repo batch and wake the worker."""
+    # a copy of the git options only, not of the whole merged config
+    git_config = {key: config_snapshot[key] for key in GIT_CONFIG_KEYS if key in config_snapshot}
+    environment = self._git_environment(git_config)
+    with self._pending_cv:
+        self._add_event_to_batch(
+            repo_root=repo_root,
+            event_type=event_type,
+            paths=paths,
+            config_snapshot=git_config,
+            wants_pull=wants_pull,
+            environment=environment,
+            now_timestamp=time.time(),
+        )
+        self._pending_cv.notify()
+
+
+def seconds_until_next_due(self, now_timestamp: float) -> float | None:
+    """
+    Time until the worker has something to do: a batch goes quiet, a batch
+    hits max_batch_seconds, or a periodic pull is due. None when nothing is
+    pending at all. Call with _pending_lock held.
+    """
+    deadlines = list(self._periodic_pull_next_at.values())
+    for batch in self._pending_batches.values():
+        deadlines.append(batch.last_event_at + batch.debounce_seconds)
+        if (
+            batch.max_batch_seconds > 0.0
+            and batch.event_types
+            and not batch.event_types.issubset(_PULL_ONLY_EVENT_TYPES)
+        ):
+            deadlines.append(batch.first_event_at + batch.max_batch_seconds)
 
+    if not deadlines:
+        return None
+    return max(0.0, min(deadlines) - now_timestamp)
 
-def worker_loop(self) -> None:
-    while True:
-        try:
-            repo_root, event_type, paths, config_snapshot, wants_pull = self._event_queue.get(
-                timeout=0.2
-            )
-            now_timestamp = time.time()
 
-            environment = self._git_environment(config_snapshot)
+def add_event_to_batch(
+    self,
+    repo_root: str,
+    event_type: str,
+    paths: list[str],
+    config_snapshot: dict,
+    wants_pull: bool,
+    environment: dict,
+    now_timestamp: float,
+) -> None:
+    """Merge one queued event into its repo batch. Call with _pending_lock held."""
+    self._update_periodic_pull_state(
+        repo_root=repo_root,
+        config_snapshot=config_snapshot,
+        now_timestamp=now_timestamp,
+    )
 
-            with self._pending_lock:
-                self._update_periodic_pull_state(
-                    repo_root=repo_root,
-                    config_snapshot=config_snapshot,
-                    now_timestamp=now_timestamp,
-                )
+    existing_batch = self._pending_batches.get(repo_root)
+    if not existing_batch:
+        existing_batch = _RepoBatch(
+            repo_root=repo_root,
+            base_message=config_snapshot["git_msg"],
+            add_timestamp_to_message=config_snapshot["git_tsmsg"],
+            timestamp_format=config_snapshot["git_tsfmt"],
+            environment=environment,
+            debounce_seconds=config_snapshot["git_debounce_seconds"],
+            git_timeout_seconds=config_snapshot["git_timeout_sec"],
+            pull_timeout_seconds=config_snapshot["git_pull_timeout_sec"],
+            push_timeout_seconds=config_snapshot["git_push_timeout_sec"],
+            backoff_start_seconds=config_snapshot["git_push_backoff_start_sec"],
+            backoff_max_seconds=config_snapshot["git_push_backoff_max_sec"],
+            pull_cooldown_min_seconds=config_snapshot["git_pull_cooldown_min_sec"],
+            pull_cooldown_max_seconds=config_snapshot["git_pull_cooldown_max_sec"],
+            max_batch_seconds=config_snapshot["git_max_batch_seconds"],
+            wants_pull=wants_pull,
+            auto_merge_on_push=config_snapshot["git_auto_merge_on_push"],
+            auto_set_upstream=config_snapshot["git_auto_set_upstream"],
+            autoresolve_mode=config_snapshot["git_autoresolve"],
+        )
+        self._pending_batches[repo_root] = existing_batch
+
+    existing_batch.base_message = config_snapshot["git_msg"]
+    existing_batch.add_timestamp_to_message = config_snapshot["git_tsmsg"]
+    existing_batch.timestamp_format = config_snapshot["git_tsfmt"]
+    existing_batch.environment = environment
+
+    existing_batch.debounce_seconds = config_snapshot["git_debounce_seconds"]
+    existing_batch.git_timeout_seconds = config_snapshot["git_timeout_sec"]
+    existing_batch.pull_timeout_seconds = config_snapshot["git_pull_timeout_sec"]
+    existing_batch.push_timeout_seconds = config_snapshot["git_push_timeout_sec"]
+    existing_batch.backoff_start_seconds = config_snapshot["git_push_backoff_start_sec"]
+    existing_batch.backoff_max_seconds = config_snapshot["git_push_backoff_max_sec"]
+
+    existing_batch.pull_cooldown_min_seconds = config_snapshot[
+        "git_pull_cooldown_min_sec"
+    ]
+    existing_batch.pull_cooldown_max_seconds = config_snapshot[
+        "git_pull_cooldown_max_sec"
+    ]
+    existing_batch.max_batch_seconds = config_snapshot["git_max_batch_seconds"]
+
+    existing_batch.auto_merge_on_push = config_snapshot[
+        "git_auto_merge_on_push"
+    ]
+    existing_batch.auto_set_upstream = config_snapshot[
+        "git_auto_set_upstream"
+    ]
+    existing_batch.autoresolve_mode = config_snapshot["git_autoresolve"]
+
+    existing_batch.wants_pull = existing_batch.wants_pull or wants_pull
+    existing_batch.last_event_at = now_timestamp
+    existing_batch.event_types.add(event_type)
+    for path_item in paths:
+        if path_item:
+            existing_batch.hinted_paths.add(path_item)
 
-                existing_batch = self._pending_batches.get(repo_root)
-                if not existing_batch:
-                    existing_batch = _RepoBatch(
-                        repo_root=repo_root,
-                        base_message=config_snapshot["git_msg"],
-                        add_timestamp_to_message=config_snapshot["git_tsmsg"],
-                        timestamp_format=config_snapshot["git_tsfmt"],
-                        environment=environment,
-                        debounce_seconds=config_snapshot["git_debounce_seconds"],
-                        git_timeout_seconds=config_snapshot["git_timeout_sec"],
-                        pull_timeout_seconds=config_snapshot["git_pull_timeout_sec"],
-                        push_timeout_seconds=config_snapshot["git_push_timeout_sec"],
-                        backoff_start_seconds=config_snapshot["git_push_backoff_start_sec"],
-                        backoff_max_seconds=config_snapshot["git_push_backoff_max_sec"],
-                        pull_cooldown_min_seconds=config_snapshot["git_pull_cooldown_min_sec"],
-                        pull_cooldown_max_seconds=config_snapshot["git_pull_cooldown_max_sec"],
-                        max_batch_seconds=config_snapshot["git_max_batch_seconds"],
-                        wants_pull=wants_pull,
-                        auto_merge_on_push=config_snapshot["git_auto_merge_on_push"],
-                        auto_set_upstream=config_snapshot["git_auto_set_upstream"],
-                        autoresolve_mode=config_snapshot["git_autoresolve"],
-                    )
-                    self._pending_batches[repo_root] = existing_batch
-
-                existing_batch.base_message = config_snapshot["git_msg"]
-                existing_batch.add_timestamp_to_message = config_snapshot["git_tsmsg"]
-                existing_batch.timestamp_format = config_snapshot["git_tsfmt"]
-                existing_batch.environment = environment
-
-                existing_batch.debounce_seconds = config_snapshot["git_debounce_seconds"]
-                existing_batch.git_timeout_seconds = config_snapshot["git_timeout_sec"]
-                existing_batch.pull_timeout_seconds = config_snapshot["git_pull_timeout_sec"]
-                existing_batch.push_timeout_seconds = config_snapshot["git_push_timeout_sec"]
-                existing_batch.backoff_start_seconds = config_snapshot["git_push_backoff_start_sec"]
-                existing_batch.backoff_max_seconds = config_snapshot["git_push_backoff_max_sec"]
-
-                existing_batch.pull_cooldown_min_seconds = config_snapshot[
-                    "git_pull_cooldown_min_sec"
-                ]
-                existing_batch.pull_cooldown_max_seconds = config_snapshot[
-                    "git_pull_cooldown_max_sec"
-                ]
-                existing_batch.max_batch_seconds = config_snapshot["git_max_batch_seconds"]
-
-                existing_batch.auto_merge_on_push = config_snapshot[
-                    "git_auto_merge_on_push"
-                ]
-                existing_batch.auto_set_upstream = config_snapshot[
-                    "git_auto_set_upstream"
-                ]
-                existing_batch.autoresolve_mode = config_snapshot["git_autoresolve"]
-
-                existing_batch.wants_pull = existing_batch.wants_pull or wants_pull
-                existing_batch.last_event_at = now_timestamp
-                existing_batch.event_types.add(event_type)
-                for path_item in paths:
-                    if path_item:
-                        existing_batch.hinted_paths.add(path_item)
-
-        except Empty:
-            pass
-
-        current_timestamp = time.time()
-        due_batches: list[_RepoBatch] = []
-        periodic_pull_events: list[tuple[str, str, list[str], dict, bool]] = []
-        with self._pending_lock:
+
+def worker_loop(self) -> None:
+    while True:
+        with self._pending_cv:
+            # sleep until the soonest deadline; enqueue() wakes us early when a
+            # new batch may be due sooner. An idle worker does not wake up at all
+            while True:
+                wait_seconds = self._seconds_until_next_due(time.time())
+                if wait_seconds is not None and wait_seconds <= 0.0:
+                    break
+                self._pending_cv.wait(timeout=wait_seconds)
+
+            current_timestamp = time.time()
+            due_batches: list[_RepoBatch] = []
             for repo_root_key, batch in list(self._pending_batches.items()):
                 quiet_due = current_timestamp - batch.last_event_at >= batch.debounce_seconds
                 forced_due = should_force_flush_batch(batch, current_timestamp)
                 if quiet_due or forced_due:
                     due_batches.append(batch)
                     del self._pending_batches[repo_root_key]
-            periodic_pull_events = self._collect_due_periodic_pull_events(current_timestamp)
+
+            for (
+                repo_root,
+                event_type,
+                paths,
+                config_snapshot,
+                wants_pull,
+            ) in self._collect_due_periodic_pull_events(current_timestamp):
+                self._add_event_to_batch(
+                    repo_root=repo_root,
+                    event_type=event_type,
+                    paths=paths,
+                    config_snapshot=config_snapshot,
+                    wants_pull=wants_pull,
+                    environment=self._git_environment(config_snapshot),
+                    now_timestamp=current_timestamp,
+                )
 
         for batch in due_batches:
             self._process_batch(batch)
-        for event in periodic_pull_events:
-            self._event_queue.put(event)
 
 
-def process_batch(self, batch: _RepoBatch) -> None:
+def hinted_paths_all_ignored(self, batch: _RepoBatch) -> bool:
+    """
+    True when the repo was clean moments ago and `git check-ignore` matches
+    every hinted path (editor swap files, build output): nothing to add.
+    """
     repo_root = batch.repo_root
-    environment = batch.environment
-
-    git_timeout_seconds = batch.git_timeout_seconds
-    pull_timeout_seconds = batch.pull_timeout_seconds
-    push_timeout_seconds = batch.push_timeout_seconds
-    backoff_start_seconds = batch.backoff_start_seconds
-    backoff_max_seconds = batch.backoff_max_seconds
+    if not batch.hinted_paths or len(batch.hinted_paths) > _MAX_IGNORE_CHECK_PATHS:
+        return False
+    if time.time() - self._last_clean_at.get(repo_root, 0.0) >= _RECENTLY_CLEAN_SECONDS:
+        return False
 
-    if self._merge_in_progress(repo_root, environment, git_timeout_seconds):
-        resolved = self._auto_resolve_merge_conflicts(
+    try:
+        result = self._run_git(
             repo_root,
-            environment,
-            git_timeout_seconds,
-            autoresolve_mode=batch.autoresolve_mode,
+            ["check-ignore", "--", *sorted(batch.hinted_paths)],
+            batch.environment,
+            timeout_seconds=batch.git_timeout_seconds,
         )
-        if not resolved:
-            self._run_git(
-                repo_root,
-                ["merge", "--abort"],
-                environment,
-                timeout_seconds=git_timeout_seconds,
-            )
-            logger.error(
-                "found unfinished merge; auto-resolve failed; merge aborted | repo=%s",
-                repo_root,
-            )
-            safe_notify(
-                name=f"merge-stuck:{repo_root}",
-                message=(
-                    f"Repository:\n{repo_root}\n\n"
-                    f"Found unfinished merge; auto-resolve failed; merge aborted."
-                ),
-            )
-            return
-
-    pull_only_batch = batch.event_types and batch.event_types.issubset(
-        _PULL_ONLY_EVENT_TYPES
+    except subprocess.TimeoutExpired:
+        return False
+    # exit 1 means nothing matched; one output line per ignored path
+    return result.returncode == 0 and len((result.stdout or "").splitlines()) == len(
+        batch.hinted_paths
     )
-    if pull_only_batch and batch.wants_pull:
-        if not self._pull_allowed_with_progression(
-            repo_root=repo_root,
-            cooldown_min_seconds=batch.pull_cooldown_min_seconds,
-            cooldown_max_seconds=batch.pull_cooldown_max_seconds,
-        ):
-            return
 
-        self._safe_pull_merge(
-            repo_root,
-            environment,
-            pull_timeout_seconds=pull_timeout_seconds,
-            operation_timeout_seconds=git_timeout_seconds,
-            autoresolve_mode=batch.autoresolve_mode,
-            auto_set_upstream=batch.auto_set_upstream,
-        )
-        return
+
+def commit_changes(self, batch: _RepoBatch) -> bool:
+    """`git add -A` + commit for a batch; False when a git step failed."""
+    repo_root = batch.repo_root
+    environment = batch.environment
+    git_timeout_seconds = batch.git_timeout_seconds
 
     try:
         add_result = self._run_git(
@@ -236,6 +288,7 @@ def process_batch(self, batch: _RepoBatch) -> None:
             ["add", "-A"],
             environment,
             timeout_seconds=git_timeout_seconds,
+            capture="stderr",
         )
     except subprocess.TimeoutExpired:
         logger.error("git add timed out | repo=%s", repo_root)
@@ -243,7 +296,7 @@ def process_batch(self, batch: _RepoBatch) -> None:
             name=f"timeout:add:{repo_root}",
             message=f"git add timed out:\n{repo_root}",
         )
-        return
+        return False
 
     if add_result.returncode != 0:
         add_error = (add_result.stderr or add_result.stdout or "git add failed").strip()
@@ -252,36 +305,39 @@ def process_batch(self, batch: _RepoBatch) -> None:
             name=f"addfail:{repo_root}",
             message=f"Repository:\n{repo_root}\n\nError:\n{add_error[:1200]}",
         )
-        return
+        return False
 
+    # after `add -A` everything worth committing is staged, so comparing the
+    # index with HEAD is enough; unlike `status` it skips a second worktree walk
     try:
-        status_result = self._run_git(
+        staged_result = self._run_git(
             repo_root,
-            ["status", "--porcelain"],
+            ["diff", "--cached", "--name-only"],
             environment,
             timeout_seconds=git_timeout_seconds,
         )
     except subprocess.TimeoutExpired:
-        logger.error("git status timed out | repo=%s", repo_root)
+        logger.error("git diff --cached timed out | repo=%s", repo_root)
         safe_notify(
             name=f"timeout:status:{repo_root}",
-            message=f"git status timed out:\n{repo_root}",
+            message=f"git diff --cached timed out:\n{repo_root}",
         )
-        return
+        return False
 
-    if status_result.returncode != 0:
-        status_error = (status_result.stderr or status_result.stdout or "git status failed").strip()
-        logger.error("git status failed | repo=%s | error=%s", repo_root, status_error[:1200])
+    if staged_result.returncode != 0:
+        staged_error = (
+            staged_result.stderr or staged_result.stdout or "git diff --cached failed"
+        ).strip()
+        logger.error("git diff --cached failed | repo=%s | error=%s", repo_root, staged_error[:1200])
         safe_notify(
             name=f"statusfail:{repo_root}",
-            message=f"Repository:\n{repo_root}\n\nError:\n{status_error[:1200]}",
+            message=f"Repository:\n{repo_root}\n\nError:\n{staged_error[:1200]}",
         )
-        return
+        return False
 
-    porcelain_text = (status_result.stdout or "").strip()
-    changed_paths = self._parse_porcelain_paths(porcelain_text)
+    changed_paths = (staged_result.stdout or "").splitlines()
 
-    if porcelain_text:
+    if changed_paths:
         commit_message = self._build_commit_message(batch, changed_paths)
         try:
             commit_result = self._run_git(
@@ -296,7 +352,7 @@ def process_batch(self, batch: _RepoBatch) -> None:
                 name=f"timeout:commit:{repo_root}",
                 message=f"git commit timed out:\n{repo_root}",
             )
-            return
+            return False
 
         if commit_result.returncode != 0:
             combined_output = (
@@ -315,7 +371,79 @@ def process_batch(self, batch: _RepoBatch) -> None:
                     name=f"commitfail:{repo_root}",
                     message=f"Repository:\n{repo_root}\n\nError:\n{commit_error[:1200]}",
                 )
-                return
+                return False
+
+    self._last_clean_at[repo_root] = time.time()
+    return True
+
+
+def process_batch(self, batch: _RepoBatch) -> None:
+    repo_root = batch.repo_root
+    environment = batch.environment
+
+    git_timeout_seconds = batch.git_timeout_seconds
+    pull_timeout_seconds = batch.pull_timeout_seconds
+    push_timeout_seconds = batch.push_timeout_seconds
+    backoff_start_seconds = batch.backoff_start_seconds
+    backoff_max_seconds = batch.backoff_max_seconds
+
+    if self._merge_in_progress(repo_root, environment, git_timeout_seconds):
+        resolved = self._auto_resolve_merge_conflicts(
+            repo_root,
+            environment,
+            git_timeout_seconds,
+            autoresolve_mode=batch.autoresolve_mode,
+        )
+        if not resolved:
+            self._run_git(
+                repo_root,
+                ["merge", "--abort"],
+                environment,
+                timeout_seconds=git_timeout_seconds,
+                capture="none",
+            )
+            logger.error(
+                "found unfinished merge; auto-resolve failed; merge aborted | repo=%s",
+                repo_root,
+            )
+            safe_notify(
+                name=f"merge-stuck:{repo_root}",
+                message=(
+                    f"Repository:\n{repo_root}\n\n"
+                    f"Found unfinished merge; auto-resolve failed; merge aborted."
+                ),
+            )
+            return
+
+    pull_only_batch = batch.event_types and batch.event_types.issubset(
+        _PULL_ONLY_EVENT_TYPES
+    )
+    if pull_only_batch and batch.wants_pull:
+        if not self._pull_allowed_with_progression(
+            repo_root=repo_root,
+            cooldown_min_seconds=batch.pull_cooldown_min_seconds,
+            cooldown_max_seconds=batch.pull_cooldown_max_seconds,
+        ):
+            return
+
+        self._safe_pull_merge(
+            repo_root,
+            environment,
+            pull_timeout_seconds=pull_timeout_seconds,
+            operation_timeout_seconds=git_timeout_seconds,
+            autoresolve_mode=batch.autoresolve_mode,
+            auto_set_upstream=batch.auto_set_upstream,
+        )
+        return
+
+    # events that only touched .git, paths outside the repo or ignored files
+    # leave nothing to add: skip the add/diff/commit round trips
+    if (
+        batch_has_worktree_paths(batch)
+        and not self._hinted_paths_all_ignored(batch)
+        and not self._commit_changes(batch)
+    ):
+        return
 
     if batch.wants_pull:
         if self._pull_allowed_with_progression(
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from lucy_notes_manager.lib.args import Template
 
-PLASMA_SYNC_TEMPLATE: Template = [
+PLASMA_SYNC_TEMPLATE: Template = (
     (
         "--plasma-widget-path",
         str,
@@ -28,4 +28,4 @@ PLASMA_SYNC_TEMPLATE: Template = [
         "If True: use CSS checkbox markers (☐/☒) via li.*::marker and real UL/LI. "
         "If False (default): render plain text only (no glyphs, no bullets).",
     ),
-]
+)
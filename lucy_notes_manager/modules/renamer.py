@@ -15,7 +15,7 @@ class Renamer(AbstractModule):
     name: str = "renamer"
     priority: int = 20
 
-    template: Template = [
+    template: Template = (
         ("--r", str, None, "Rename file. Example: --r new_name.md."),
         (
             "--auto-rename",
@@ -23,7 +23,7 @@ class Renamer(AbstractModule):
             False,  # IMPORTANT: for your argparse bool handling, default is a bool, not [False]
             "On create: t|txt -> DD-MM.txt, m|md -> DD-MM.md. If exists -> HHMM-DD-MM.ext",
         ),
-    ]
+    )
 
     def _apply_manual(self, *, path: str, config: dict) -> Optional[IgnoreMap]:
         if not config["r"] or not config["r"].strip():
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, List, Optional
 
-from lucy_notes_manager.lib.args import delete_args_from_string
+from lucy_notes_manager.lib.args import delete_args_from_string, flag_to_dest
 from lucy_notes_manager.modules.abstract_module import (
     AbstractModule,
     Context,
@@ -16,7 +16,7 @@ class Sys(AbstractModule):
     name: str = "sys"
     priority: int = 0
 
-    template = [
+    template = (
         ("--mods", bool, False, "Print loaded modules and their priorities."),
         (
             "--config",
@@ -37,11 +37,9 @@ class Sys(AbstractModule):
             "Print SysInfo commands help: --mods, --man, --config.",
         ),
         ("--sys-event", bool, False, "Print current filesystem event details."),
-    ]
+    )
 
-    @staticmethod
-    def _flag_to_dest(flag: str) -> str:
-        return flag.lstrip("-").replace("-", "_")
+    _flag_to_dest = staticmethod(flag_to_dest)
 
     @staticmethod
     def _type_name(type_value: Any) -> str:
@@ -282,8 +280,8 @@ class Sys(AbstractModule):
                 insert_at = index + len(block)
                 file_lines[insert_at:insert_at] = [cleaned_line]
 
-        with open(ctx.path, "w", encoding="utf-8") as file_handle:
-            file_handle.writelines(file_lines)
+        with open(ctx.path, "wb") as file_handle:
+            file_handle.write("".join(file_lines).encode("utf-8"))
 
         return {ctx.path: 1}
 
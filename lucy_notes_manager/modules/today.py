@@ -20,7 +20,7 @@ class Today(AbstractModule):
     name: str = "today"
     priority: int = 25
 
-    template: Template = [
+    template: Template = (
         (
             "--today-now-name",
             str,
@@ -45,7 +45,7 @@ class Today(AbstractModule):
             False,
             "Force OS filesystem mtime checks even inside Git repositories.",
         ),
-    ]
+    )
 
     def _resolve_paths(self, ctx: Context) -> tuple[str, str] | None:
         if (
@@ -15,14 +15,14 @@ class TodoFormatter(AbstractModule):
     name: str = "todo_formatter"
     priority: int = 10
 
-    template: Template = [
+    template: Template = (
         (
             "--todo",
             bool,
             False,
             "Enable TODO formatting: converts list items like '- task' into unchecked checkboxes '- [ ] task' in the current file. ",
         ),
-    ]
+    )
 
     def _apply(
         self, *, path: str, config: dict, arg_lines: dict
@@ -72,12 +72,12 @@ class TodoFormatter(AbstractModule):
             return None
 
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.writelines(new_lines)
+            with open(path, "wb") as f:
+                f.write("".join(new_lines).encode("utf-8"))
         except OSError:
             return None
 
-        return {os.path.abspath(path): 1}
+        return {path: 1}
 
     def created(self, ctx: Context, system: System) -> Optional[IgnoreMap]:
         return self._apply(path=ctx.path, config=ctx.config, arg_lines=ctx.arg_lines)
@@ -1,10 +1,12 @@
 import logging
+import os
 import time
 from typing import List
 
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 
-from lucy_notes_manager.file_handler import FileHandler
+from lucy_notes_manager.file_handler import DebouncedDispatcher, FileHandler
 from lucy_notes_manager.lib.args import Template, setup_config_and_cli_args
 from lucy_notes_manager.module_manager import ModuleManager
 from lucy_notes_manager.modules.abstract_module import AbstractModule
@@ -18,7 +20,7 @@ from lucy_notes_manager.modules.todo_formatter import TodoFormatter
 
 # from lucy_notes_manager.modules.cmd import Cmd
 
-TEMPLATE_STARTUP_ARGS: Template = [
+TEMPLATE_STARTUP_ARGS: Template = (
     (
         "--sys-config-path",
         str,
@@ -49,13 +51,20 @@ TEMPLATE_STARTUP_ARGS: Template = [
         20,
         "Cooldown for 'opened' events per file, in seconds. Prevents editor spam. Default: 30 seconds).",
     ),
+    (
+        "--sys-debounce-ms",
+        int,
+        150,
+        "Collapse bursts of events per file and run modules once the file is quiet "
+        "for this many milliseconds. Set 0 to run modules on every event. Default: 150.",
+    ),
     (
         "--sys-enable-experimental-modules",
         bool,
         False,
         "Enable modules marked as experimental.",
     ),
-]
+)
 
 MODULES: List[AbstractModule] = [
     Banner(),
@@ -96,14 +105,29 @@ if "/path/to/note/dir" in config["sys_notes_dirs"]:
     )
 
 observer = Observer()
+if isinstance(observer, PollingObserver):
+    logging.warning(
+        "No native filesystem events backend (inotify/FSEvents/kqueue/ReadDirectoryChangesW) "
+        "available, watchdog falls back to polling: expect higher latency and CPU use."
+    )
+
+# one dispatcher for every notes dir: modules keep running one at a time
+dispatcher = (
+    DebouncedDispatcher(debounce_seconds=config["sys_debounce_ms"] / 1000.0)
+    if config["sys_debounce_ms"] > 0
+    else None
+)
 
 for path in config["sys_notes_dirs"]:
     observer.schedule(
         FileHandler(
             modules=modules,
             open_cooldown_seconds=config["sys_on_open_cooldown"],
+            dispatcher=dispatcher,
         ),
-        path=path,
+        # bytes path: watchdog then reports bytes paths, so the .git/dotfile
+        # filter rejects events before they are decoded
+        path=os.fsencode(path),
         recursive=True,
     )
 
@@ -116,3 +140,6 @@ except KeyboardInterrupt:
     observer.stop()
 
 observer.join()
+if dispatcher is not None:
+    # saves still inside the debounce window
+    dispatcher.flush()
@@ -7,7 +7,7 @@ from lucy_notes_manager.modules.banner import Banner
 
 
 def test_apply_inserts_banner_from_first_line(tmp_path: Path, monkeypatch):
-    monkeypatch.setattr(banner_mod.pyfiglet, "figlet_format", lambda _txt: "ASCII\n")
+    monkeypatch.setattr(banner_mod, "_figlet_text", lambda _txt: "ASCII\n")
 
     path = tmp_path / "note.md"
     path.write_text("--banner Hello\nbody\n", encoding="utf-8")
@@ -26,7 +26,7 @@ def test_apply_inserts_banner_from_first_line(tmp_path: Path, monkeypatch):
 
 
 def test_apply_replaces_non_first_line_and_keeps_remaining_text(tmp_path: Path, monkeypatch):
-    monkeypatch.setattr(banner_mod.pyfiglet, "figlet_format", lambda _txt: "B\n")
+    monkeypatch.setattr(banner_mod, "_figlet_text", lambda _txt: "B\n")
 
     path = tmp_path / "note.md"
     path.write_text("head\n--banner X tail\n", encoding="utf-8")
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 
 from watchdog.events import FileDeletedEvent, FileModifiedEvent
 
+import lucy_notes_manager.modules.cmd as cmd_mod
 from lucy_notes_manager.modules.abstract_module import Context, System
-from lucy_notes_manager.modules.cmd import Cmd
+from lucy_notes_manager.modules.cmd import Cmd, CmdRun
 
 
 def test_collect_runs_groups_tokens_by_line():
@@ -38,6 +40,7 @@ def test_apply_replaces_command_line_with_output_block(tmp_path: Path, monkeypat
             "cmd_max_bytes": 1000,
             "cmd_show_stdout": True,
             "cmd_show_stderr": True,
+            "cmd_parallel": False,
         },
         arg_lines={"c": [1, 1]},
     )
@@ -65,3 +68,122 @@ def test_deleted_event_is_noop():
         modules=[],
     )
     assert module.deleted(ctx, system) is None
+
+
+def test_run_all_parallel_runs_commands_together_and_keeps_order():
+    module = Cmd()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_run_cmd(*, cmd_tokens, cwd, timeout, max_bytes=None):
+        barrier.wait()  # deadlocks unless all three run at the same time
+        return 0, cmd_tokens[0], ""
+
+    module._run_cmd = fake_run_cmd  # type: ignore[method-assign]
+    runs = [CmdRun(lineno_1based=n, cmd_tokens=[f"c{n}"]) for n in (1, 2, 3)]
+
+    results = module._run_all(runs, cwd="/tmp", timeout=5, parallel=True)
+    assert [out for _code, out, _err in results] == ["c1", "c2", "c3"]
+
+
+def test_run_all_runs_commands_one_by_one_bottom_line_first_by_default():
+    module = Cmd()
+    started: list[str] = []
+    running = threading.Lock()
+
+    def fake_run_cmd(*, cmd_tokens, cwd, timeout, max_bytes=None):
+        assert running.acquire(blocking=False), "commands overlapped"
+        started.append(cmd_tokens[0])
+        running.release()
+        return 0, cmd_tokens[0], ""
+
+    module._run_cmd = fake_run_cmd  # type: ignore[method-assign]
+    runs = [CmdRun(lineno_1based=n, cmd_tokens=[f"c{n}"]) for n in (1, 2, 3)]
+
+    results = module._run_all(runs, cwd="/tmp", timeout=5)
+    assert started == ["c3", "c2", "c1"]
+    assert [out for _code, out, _err in results] == ["c1", "c2", "c3"]
+
+
+def test_run_cmd_keeps_only_max_bytes_plus_one_of_output(tmp_path: Path):
+    module = Cmd()
+
+    code, out, err = module._run_cmd(
+        cmd_tokens=["sh", "-c", "yes | head -c 1000000; echo oops >&2"],
+        cwd=str(tmp_path),
+        timeout=5,
+        max_bytes=10,
+    )
+
+    assert code == 0
+    assert out == "y\ny\ny\ny\ny\ny"
+    assert err == "oops\n"
+
+
+def test_crlf_output_past_max_bytes_still_gets_clip_marker(tmp_path: Path):
+    module = Cmd()
+
+    _code, out, _err = module._run_cmd(
+        cmd_tokens=["printf", "a\\r\\nb\\r\\nc\\r\\n"],
+        cwd=str(tmp_path),
+        timeout=5,
+        max_bytes=5,
+    )
+
+    block = module._build_block(
+        cmd_tokens=["printf"],
+        stdout=out,
+        stderr="",
+        show_stdout=True,
+        show_stderr=False,
+        max_bytes=5,
+    )
+    assert block[1] == "a\nb\n…(clipped)…\n"
+
+
+def test_run_cmd_rejects_unknown_command_without_spawning(tmp_path: Path, monkeypatch):
+    module = Cmd()
+
+    def fail_popen(*_args, **_kwargs):
+        raise AssertionError("Popen must not be called")
+
+    monkeypatch.setattr(cmd_mod.subprocess, "Popen", fail_popen)
+
+    code, out, err = module._run_cmd(
+        cmd_tokens=["definitely-not-a-command-xyz"],
+        cwd=str(tmp_path),
+        timeout=5,
+    )
+
+    assert code == 127
+    assert out == ""
+    assert err == "Command not found: definitely-not-a-command-xyz\n"
+
+
+def test_collect_runs_orders_runs_by_line_and_drops_empty_tokens():
+    module = Cmd()
+    ctx = Context(
+        path="/tmp/x.md",
+        config={"c": ["ls", "", "echo", "hi", ""]},
+        arg_lines={"c": [5, 5, 2, 2, 9]},
+    )
+
+    runs = module._collect_runs(ctx)
+
+    assert runs == [
+        CmdRun(lineno_1based=2, cmd_tokens=["echo", "hi"]),
+        CmdRun(lineno_1based=5, cmd_tokens=["ls"]),
+    ]
+
+
+def test_clip_counts_bytes_not_characters():
+    module = Cmd()
+
+    assert module._clip("abc", 3) == "abc"
+    assert module._clip("abcd", 3) == "abc\n…(clipped)…\n"
+    assert module._clip("ééé", 6) == "ééé"
+    # a character cut in half is dropped, not replaced
+    assert module._clip("ééé", 5) == "éé\n…(clipped)…\n"
+    assert module._clip("abc", 0) == ""
+    # U+FFFD from undecodable process output is kept; only the cut "é" goes
+    assert module._clip("a\ufffdb\u00e9\u00e9", 7) == "a\ufffdb\u00e9\n…(clipped)…\n"
+    assert module._clip("\u00e9\u20ac", 4) == "\u00e9\n…(clipped)…\n"
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import subprocess
 from datetime import datetime
 
 import pytest
 from watchdog.events import FileMovedEvent, FileOpenedEvent
 
 import lucy_notes_manager.modules.git as git_mod
+from lucy_notes_manager.lib.args import flag_to_dest
 from lucy_notes_manager.modules.abstract_module import Context, System
 from lucy_notes_manager.modules.git import Git, _RepoBatch
-from lucy_notes_manager.modules.git.worker import should_force_flush_batch
+from lucy_notes_manager.modules.git.config import GIT_TEMPLATE
+from lucy_notes_manager.modules.git.worker import (
+    batch_has_worktree_paths,
+    should_force_flush_batch,
+)
 
 
 @pytest.fixture
@@ -30,11 +36,6 @@ def test_git_module_is_marked_experimental(git_module):
     assert git_module.experimental is True
 
 
-def test_parse_porcelain_paths_handles_regular_and_renamed(git_module):
-    text = " M a.txt\nR  old.md -> new.md\n?? x.py\n"
-    assert git_module._parse_porcelain_paths(text) == ["a.txt", "new.md", "x.py"]
-
-
 def test_push_rejected_needs_pull_detects_common_messages(git_module):
     assert git_module._push_rejected_needs_pull("non-fast-forward update rejected")
     assert not git_module._push_rejected_needs_pull("everything up-to-date")
@@ -47,6 +48,16 @@ def test_union_resolve_text_merges_conflict_content(git_module):
     assert merged == "A\none\ntwo\nB\n"
 
 
+def test_union_resolve_text_handles_crlf_unclosed_and_clean_files(git_module):
+    merged = git_module._union_resolve_text(
+        "A\r\n<<<<<<< ours\r\none\r\n=======\r\ntwo\r\n>>>>>>> theirs\r\n"
+    )
+    assert merged == "A\r\none\r\ntwo\r\n"
+
+    assert git_module._union_resolve_text("<<<<<<< ours\none\n=======\ntwo\n") is None
+    assert git_module._union_resolve_text("no <<<<<<< markers here\n") is None
+
+
 def test_build_commit_message_includes_event_summary_and_names(git_module, monkeypatch):
     class _FakeDateTime:
         @classmethod
@@ -80,6 +91,32 @@ def test_build_commit_message_includes_event_summary_and_names(git_module, monke
     assert msg.endswith("[2026]")
 
 
+def test_build_commit_message_caps_shown_names(git_module):
+    batch = _RepoBatch(
+        repo_root="/repo",
+        base_message="Auto",
+        add_timestamp_to_message=False,
+        timestamp_format="%Y",
+        environment={},
+        debounce_seconds=0.5,
+        git_timeout_seconds=5.0,
+        pull_timeout_seconds=5.0,
+        push_timeout_seconds=5.0,
+        backoff_start_seconds=2.0,
+        backoff_max_seconds=8.0,
+        pull_cooldown_min_seconds=1.0,
+        pull_cooldown_max_seconds=4.0,
+        max_batch_seconds=8.0,
+        hinted_paths={"/repo/b.md", "/repo/a.md"},
+    )
+
+    paths = [f"/repo/n{index}.md" for index in range(12)] + [""]
+    msg = git_module._build_commit_message(batch, paths)
+    assert msg == "Auto: change " + ", ".join(f"n{i}.md" for i in range(8)) + ", +4 more"
+
+    assert git_module._build_commit_message(batch, []) == "Auto: change a.md, b.md"
+
+
 def test_pull_allowed_with_progression(git_module, monkeypatch):
     times = iter([0.0, 1.0, 30.0])
     monkeypatch.setattr(git_mod.time, "time", lambda: next(times))
@@ -90,11 +127,21 @@ def test_pull_allowed_with_progression(git_module, monkeypatch):
 
 
 def test_register_push_failure_updates_backoff(git_module, monkeypatch):
+    bounds: list[tuple[float, float]] = []
     monkeypatch.setattr(git_mod.time, "time", lambda: 100.0)
+    monkeypatch.setattr(
+        git_mod.random, "uniform", lambda low, high: bounds.append((low, high)) or high
+    )
+
     git_module._register_push_failure("/repo", backoff_start_seconds=5.0, backoff_max_seconds=20.0)
+    assert bounds == [(5.0, 15.0)]
+    assert git_module._push_backoff_seconds["/repo"] == 15.0
+    assert git_module._push_next_allowed_at["/repo"] == 115.0
 
-    assert git_module._push_backoff_seconds["/repo"] == 10.0
-    assert git_module._push_next_allowed_at["/repo"] == 110.0
+    # the next wait is drawn from [start, 3 * previous], capped at the max
+    git_module._register_push_failure("/repo", backoff_start_seconds=5.0, backoff_max_seconds=20.0)
+    assert bounds[-1] == (5.0, 45.0)
+    assert git_module._push_backoff_seconds["/repo"] == 20.0
 
 
 def test_update_periodic_pull_state_default_disabled(git_module):
@@ -254,3 +301,358 @@ def test_handle_moved_uses_src_and_dest_paths_for_hints(git_module, monkeypatch)
     git_module._handle(ctx, system, "moved")
     assert recorded["paths"] == ["/repo/old.md", "/repo/new.md"]
     assert recorded["event_type"] == "moved"
+
+
+def test_handle_moved_canonicalises_hints_through_symlinked_dir(git_module, monkeypatch, tmp_path):
+    repo_root = tmp_path / "repo"
+    (repo_root / ".git").mkdir(parents=True)
+    (repo_root / "notes").mkdir()
+    (repo_root / "notes" / "new.md").write_text("x\n", encoding="utf-8")
+    link = tmp_path / "link"
+    link.symlink_to(repo_root / "notes", target_is_directory=True)
+
+    recorded = {}
+    monkeypatch.setattr(
+        git_module,
+        "_enqueue",
+        lambda **kwargs: recorded.update(kwargs),
+    )
+
+    event = FileMovedEvent(str(link / "old.md"), str(link / "new.md"))
+    ctx = Context(path=str(repo_root / "notes" / "new.md"), config={}, arg_lines={})
+    system = System(event=event, global_template=[], modules=[git_module])
+
+    git_module._handle(ctx, system, "moved")
+    assert recorded["paths"] == [
+        str(repo_root / "notes" / "old.md"),
+        str(repo_root / "notes" / "new.md"),
+    ]
+    batch = _RepoBatch(
+        repo_root=recorded["repo_root"],
+        base_message="Auto",
+        add_timestamp_to_message=False,
+        timestamp_format="%Y",
+        environment={},
+        debounce_seconds=0.5,
+        git_timeout_seconds=5.0,
+        pull_timeout_seconds=6.0,
+        push_timeout_seconds=7.0,
+        backoff_start_seconds=2.0,
+        backoff_max_seconds=8.0,
+        pull_cooldown_min_seconds=1.0,
+        pull_cooldown_max_seconds=4.0,
+        max_batch_seconds=8.0,
+        event_types={"moved"},
+        hinted_paths=set(recorded["paths"]),
+    )
+    assert batch_has_worktree_paths(batch) is True
+
+
+def test_enqueue_merges_events_into_one_batch(git_module, monkeypatch):
+    config = {flag_to_dest(flag): default for flag, _typ, default, _desc in GIT_TEMPLATE}
+    config["banner"] = "date"
+    times = iter([100.0, 101.0])
+    monkeypatch.setattr(git_mod.worker.time, "time", lambda: next(times))
+
+    git_module._enqueue(
+        repo_root="/repo",
+        event_type="modified",
+        paths=["/repo/a.md"],
+        config_snapshot=config,
+        wants_pull=False,
+    )
+    git_module._enqueue(
+        repo_root="/repo",
+        event_type="created",
+        paths=["/repo/b.md"],
+        config_snapshot=config,
+        wants_pull=False,
+    )
+
+    batch = git_module._pending_batches["/repo"]
+    assert batch.event_types == {"modified", "created"}
+    assert batch.hinted_paths == {"/repo/a.md", "/repo/b.md"}
+    assert batch.last_event_at == 101.0
+
+
+def test_seconds_until_next_due_picks_soonest_deadline(git_module):
+    assert git_module._seconds_until_next_due(now_timestamp=100.0) is None
+
+    git_module._pending_batches["/repo"] = _RepoBatch(
+        repo_root="/repo",
+        base_message="Auto",
+        add_timestamp_to_message=False,
+        timestamp_format="%Y",
+        environment={},
+        debounce_seconds=30.0,
+        git_timeout_seconds=5.0,
+        pull_timeout_seconds=6.0,
+        push_timeout_seconds=7.0,
+        backoff_start_seconds=2.0,
+        backoff_max_seconds=8.0,
+        pull_cooldown_min_seconds=1.0,
+        pull_cooldown_max_seconds=4.0,
+        max_batch_seconds=10.0,
+        first_event_at=95.0,
+        last_event_at=99.0,
+        event_types={"modified"},
+    )
+    # forced flush (95 + 10) comes before the quiet deadline (99 + 30)
+    assert git_module._seconds_until_next_due(now_timestamp=100.0) == 5.0
+
+    git_module._periodic_pull_next_at["/other"] = 102.0
+    assert git_module._seconds_until_next_due(now_timestamp=100.0) == 2.0
+    assert git_module._seconds_until_next_due(now_timestamp=200.0) == 0.0
+
+
+def test_process_batch_skips_add_when_hints_are_outside_worktree(git_module, monkeypatch):
+    monkeypatch.setattr(git_module, "_merge_in_progress", lambda *_args, **_kwargs: False)
+    monkeypatch.setattr(
+        git_module,
+        "_commit_changes",
+        lambda _batch: (_ for _ in ()).throw(
+            AssertionError("nothing in the work tree changed, nothing to add")
+        ),
+    )
+    push_calls: list[list[str]] = []
+    monkeypatch.setattr(
+        git_module,
+        "_run_git",
+        lambda _repo, arguments, *_args, **_kwargs: push_calls.append(arguments)
+        or subprocess.CompletedProcess(arguments, 0, "", ""),
+    )
+
+    batch = _RepoBatch(
+        repo_root="/repo",
+        base_message="Auto",
+        add_timestamp_to_message=False,
+        timestamp_format="%Y",
+        environment={},
+        debounce_seconds=0.5,
+        git_timeout_seconds=5.0,
+        pull_timeout_seconds=6.0,
+        push_timeout_seconds=7.0,
+        backoff_start_seconds=2.0,
+        backoff_max_seconds=8.0,
+        pull_cooldown_min_seconds=1.0,
+        pull_cooldown_max_seconds=4.0,
+        max_batch_seconds=8.0,
+        event_types={"moved"},
+        hinted_paths={"/repo/.git/index", "/elsewhere/note.md"},
+    )
+    assert batch_has_worktree_paths(batch) is False
+
+    git_module._process_batch(batch)
+    assert push_calls == [["push"]]
+
+    batch.hinted_paths.add("/repo/note.md")
+    assert batch_has_worktree_paths(batch) is True
+
+
+def test_git_environment_is_built_once_per_key(git_module):
+    plain = git_module._git_environment({"git_key": ""})
+    assert plain["GIT_TERMINAL_PROMPT"] == "0"
+    assert "GIT_SSH_COMMAND" not in plain
+    assert git_module._git_environment({"git_key": " "}) is plain
+
+    keyed = git_module._git_environment({"git_key": "/keys/id"})
+    assert keyed["GIT_SSH_COMMAND"].startswith('ssh -i "/keys/id" ')
+    assert git_module._git_environment({"git_key": "/keys/id"}) is keyed
+
+
+def test_run_git_sends_uncaptured_streams_to_devnull(git_module, monkeypatch):
+    calls: list[dict] = []
+    monkeypatch.setattr(
+        git_mod.operations.subprocess,
+        "run",
+        lambda args, **kwargs: calls.append(kwargs) or subprocess.CompletedProcess(args, 0),
+    )
+
+    git_module._run_git("/repo", ["status"], {}, 5.0)
+    git_module._run_git("/repo", ["add", "-A"], {}, 5.0, capture="stderr")
+    git_module._run_git("/repo", ["merge", "--abort"], {}, 5.0, capture="none")
+
+    assert [(c["stdout"], c["stderr"]) for c in calls] == [
+        (subprocess.PIPE, subprocess.PIPE),
+        (subprocess.DEVNULL, subprocess.PIPE),
+        (subprocess.DEVNULL, subprocess.DEVNULL),
+    ]
+
+
+def test_auto_resolve_checks_out_and_adds_all_conflicts_at_once(git_module, monkeypatch):
+    calls: list[list[str]] = []
+    monkeypatch.setattr(
+        git_module, "_conflicted_files", lambda *_args: ["a.md", "b.md", "c.md"]
+    )
+    monkeypatch.setattr(
+        git_module,
+        "_run_git",
+        lambda _repo, arguments, *_args, **_kwargs: calls.append(arguments)
+        or subprocess.CompletedProcess(arguments, 0, "", ""),
+    )
+
+    assert git_module._auto_resolve_merge_conflicts("/repo", {}, 5.0, autoresolve_mode="theirs")
+    assert calls == [
+        ["checkout", "--theirs", "--", "a.md", "b.md", "c.md"],
+        ["add", "--", "a.md", "b.md", "c.md"],
+        ["commit", "--no-edit"],
+    ]
+
+
+def test_run_git_for_paths_splits_long_pathspecs(git_module, monkeypatch):
+    calls: list[list[str]] = []
+    monkeypatch.setattr(git_mod.operations, "_MAX_PATHSPEC_BYTES", 10)
+    monkeypatch.setattr(
+        git_module,
+        "_run_git",
+        lambda _repo, arguments, *_args, **_kwargs: calls.append(arguments)
+        or subprocess.CompletedProcess(arguments, 0, "", ""),
+    )
+
+    git_module._run_git_for_paths("/repo", ["add"], ["aaaa", "bbbb", "cccc"], {}, 5.0)
+    assert calls == [["add", "--", "aaaa", "bbbb"], ["add", "--", "cccc"]]
+
+
+def test_union_auto_resolve_rewrites_file_keeping_crlf(git_module, monkeypatch, tmp_path):
+    note = tmp_path / "a.md"
+    note.write_bytes(
+        b"A\r\n<<<<<<< ours\r\none \xff\r\n=======\r\ntwo\r\n>>>>>>> theirs\r\n"
+    )
+    monkeypatch.setattr(git_module, "_conflicted_files", lambda *_args: ["a.md"])
+    monkeypatch.setattr(
+        git_module,
+        "_run_git",
+        lambda _repo, arguments, *_args, **_kwargs: subprocess.CompletedProcess(
+            arguments, 0, "", ""
+        ),
+    )
+
+    assert git_module._auto_resolve_merge_conflicts(
+        str(tmp_path), {}, 5.0, autoresolve_mode="union"
+    )
+    assert note.read_bytes() == b"A\r\none \xff\r\ntwo\r\n"
+
+
+def test_merge_in_progress_reads_merge_head_from_git_dir(git_module, tmp_path):
+    repo = tmp_path / "repo"
+    (repo / ".git").mkdir(parents=True)
+    assert git_module._merge_in_progress(str(repo), {}, 5.0) is False
+
+    (repo / ".git" / "MERGE_HEAD").write_text("abc\n", encoding="utf-8")
+    assert git_module._merge_in_progress(str(repo), {}, 5.0) is True
+
+    # linked worktree: .git is a file pointing at the real git dir
+    worktree = tmp_path / "worktree"
+    worktree.mkdir()
+    (worktree / ".git").write_text("gitdir: ../repo/.git\n", encoding="utf-8")
+    assert git_module._merge_in_progress(str(worktree), {}, 5.0) is True
+
+
+def test_has_upstream_skips_git_only_when_config_names_no_upstream(git_module, tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    git_dir = repo / ".git"
+    git_dir.mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    config_path = git_dir / "config"
+    environment = {"HOME": str(tmp_path / "home"), "XDG_CONFIG_HOME": str(tmp_path / "xdg")}
+
+    calls = []
+
+    def fake_run_git(repo_root, arguments, environment, timeout_seconds, capture="both"):
+        calls.append(arguments)
+        return subprocess.CompletedProcess(arguments, 0, "origin/main\n", "")
+
+    monkeypatch.setattr(git_module, "_run_git", fake_run_git)
+
+    # only another branch is configured: answered from disk
+    config_path.write_text('[core]\n\tbare = false\n[branch "other"]\n\tremote = origin\n', encoding="utf-8")
+    assert git_module._has_upstream(str(repo), environment, 5.0) is False
+    assert calls == []
+
+    # this branch (any case) or an include: git decides
+    for config_text in (
+        '[Branch "main"]\n\tremote = origin\n\tmerge = refs/heads/main\n',
+        "[includeIf \"gitdir:~/notes/\"]\n\tpath = extra\n",
+    ):
+        config_path.write_text(config_text, encoding="utf-8")
+        assert git_module._has_upstream(str(repo), environment, 5.0) is True
+    assert len(calls) == 2
+
+    config_path.write_text("[core]\n", encoding="utf-8")
+    assert git_module._has_upstream(str(repo), {**environment, "GIT_DIR": "/elsewhere"}, 5.0) is True
+    assert len(calls) == 3
+
+
+def test_commit_changes_uses_staged_diff_and_skips_empty_commit(git_module, monkeypatch):
+    calls = []
+    staged_output = {"text": ""}
+
+    def fake_run_git(repo_root, arguments, environment, timeout_seconds, capture="both"):
+        calls.append(arguments[0])
+        stdout = staged_output["text"] if arguments[0] == "diff" else ""
+        return subprocess.CompletedProcess(arguments, 0, stdout, "")
+
+    monkeypatch.setattr(git_module, "_run_git", fake_run_git)
+    batch = _RepoBatch(
+        repo_root="/repo",
+        base_message="Auto",
+        add_timestamp_to_message=False,
+        timestamp_format="%Y",
+        environment={},
+        debounce_seconds=0.5,
+        git_timeout_seconds=5.0,
+        pull_timeout_seconds=5.0,
+        push_timeout_seconds=5.0,
+        backoff_start_seconds=2.0,
+        backoff_max_seconds=8.0,
+        pull_cooldown_min_seconds=1.0,
+        pull_cooldown_max_seconds=4.0,
+        max_batch_seconds=8.0,
+        event_types={"modified"},
+    )
+
+    assert git_module._commit_changes(batch) is True
+    assert calls == ["add", "diff"]
+
+    calls.clear()
+    staged_output["text"] = "notes/a.md\n"
+    assert git_module._commit_changes(batch) is True
+    assert calls == ["add", "diff", "commit"]
+
+
+def test_hinted_paths_all_ignored_needs_recent_clean_state(git_module, monkeypatch):
+    calls = []
+
+    def fake_run_git(repo_root, arguments, environment, timeout_seconds, capture="both"):
+        calls.append(arguments)
+        return subprocess.CompletedProcess(arguments, 0, "/repo/.a.swp\n/repo/.b.swp\n", "")
+
+    monkeypatch.setattr(git_module, "_run_git", fake_run_git)
+    monkeypatch.setattr(git_mod.worker.time, "time", lambda: 100.0)
+    batch = _RepoBatch(
+        repo_root="/repo",
+        base_message="Auto",
+        add_timestamp_to_message=False,
+        timestamp_format="%Y",
+        environment={},
+        debounce_seconds=0.5,
+        git_timeout_seconds=5.0,
+        pull_timeout_seconds=5.0,
+        push_timeout_seconds=5.0,
+        backoff_start_seconds=2.0,
+        backoff_max_seconds=8.0,
+        pull_cooldown_min_seconds=1.0,
+        pull_cooldown_max_seconds=4.0,
+        max_batch_seconds=8.0,
+        hinted_paths={"/repo/.a.swp", "/repo/.b.swp"},
+    )
+
+    assert git_module._hinted_paths_all_ignored(batch) is False
+    assert calls == []
+
+    git_module._last_clean_at["/repo"] = 98.0
+    assert git_module._hinted_paths_all_ignored(batch) is True
+    assert calls == [["check-ignore", "--", "/repo/.a.swp", "/repo/.b.swp"]]
+
+    batch.hinted_paths.add("/repo/note.md")
+    assert git_module._hinted_paths_all_ignored(batch) is False
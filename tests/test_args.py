@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import os
+import shlex
 import sys
 from pathlib import Path
 
+import pytest
+
+import lucy_notes_manager.lib.args as args_mod
+
 from lucy_notes_manager.lib.args import (
+    _split_quoted,
     delete_args_from_string,
     get_args_from_file,
     get_config_args,
@@ -103,3 +110,183 @@ def test_setup_config_and_cli_args_keeps_config_values_when_cli_uses_defaults(
     assert unknown == []
     assert known["sys_notes_dirs"] == ["/notes/a", "/notes/b"]
     assert known["sys_debug"] is True
+
+
+def test_parse_args_reuses_parser_without_sharing_list_defaults():
+    template = [
+        ("--tags", str, [], ""),
+    ]
+
+    first, _ = parse_args(args=[], template=template)
+    first["tags"].append("leaked")
+    second, _ = parse_args(args=[], template=template)
+
+    assert second["tags"] == []
+    assert template[0][2] == []
+
+
+def test_get_args_from_file_caches_by_stat_and_returns_fresh_copies(tmp_path: Path):
+    path = tmp_path / "note.md"
+    path.write_text("--tags a b\n", encoding="utf-8")
+    template = [
+        ("--tags", str, [], ""),
+    ]
+
+    known, _unknown, arg_lines = get_args_from_file(str(path), template)
+    known["tags"].append("leaked")
+    arg_lines["tags"].append(99)
+
+    known, _unknown, arg_lines = get_args_from_file(str(path), template)
+    assert known["tags"] == ["a", "b"]
+    assert arg_lines["tags"] == [1, 1]
+
+    path.write_text("\n--tags c\n", encoding="utf-8")
+    known, _unknown, arg_lines = get_args_from_file(str(path), template)
+    assert known["tags"] == ["c"]
+    assert arg_lines["tags"] == [2]
+
+
+def test_delete_args_from_string_plain_and_quoted_lines_split_alike():
+    assert delete_args_from_string("keep --c ls\n", ["--c"]) == "keep\n"
+    assert delete_args_from_string("'a b' --c ls\n", ["--c"]) == "'a b'\n"
+
+
+def test_merge_known_args_returns_base_when_nothing_overrides():
+    base = {"a": 1}
+
+    assert merge_known_args(base, {}) is base
+    assert merge_known_args(base, {"a": None, "b": ""}) is base
+
+
+def test_split_quoted_matches_shlex():
+    lines = [
+        '--banner "hello world" --tags a \'b c\'',
+        "--name a\"b c\"d ''",
+        '--x "" y',
+    ]
+    for line in lines:
+        assert _split_quoted(line) == tuple(shlex.split(line))
+
+    with pytest.raises(ValueError):
+        _split_quoted('--banner "unclosed')
+
+
+def test_plain_line_split_keeps_non_shell_whitespace_inside_words():
+    for line in ["b--x\x0c\xa0b", "--banner a\u2003b\x0bc", "--c  ls\t-l\r"]:
+        assert args_mod._split_line(line) == tuple(shlex.split(line))
+        spans = args_mod._word_spans(line)
+        assert tuple(value for _start, _end, value in spans) == tuple(shlex.split(line))
+
+
+def test_get_args_from_file_sees_same_mtime_and_size_rewrite(tmp_path: Path):
+    path = tmp_path / "note.md"
+    path.write_text("--tags a\n", encoding="utf-8")
+    template = [
+        ("--tags", str, [], ""),
+    ]
+    assert get_args_from_file(str(path), template)[0]["tags"] == ["a"]
+
+    st = os.stat(path)
+    path.write_text("--tags b\n", encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))  # same mtime, same size
+
+    # the rewrite still moved ctime, so the signature differs anyway
+    assert get_args_from_file(str(path), template)[0]["tags"] == ["b"]
+    assert get_args_from_file(str(path), template, force_reload=True)[0]["tags"] == ["b"]
+    assert get_args_from_file(str(path), template)[0]["tags"] == ["b"]
+
+
+def test_get_args_from_file_ignores_entry_left_by_another_template(tmp_path: Path, monkeypatch):
+    path = tmp_path / "note.md"
+    path.write_text("--tags a\n", encoding="utf-8")
+    template = [
+        ("--tags", str, [], ""),
+    ]
+    assert get_args_from_file(str(path), template)[0]["tags"] == ["a"]
+
+    # a dead template whose id() was handed to `template`
+    with args_mod._FILE_ARGS_CACHE_LOCK:
+        for key, (_template, file_args) in args_mod._FILE_ARGS_CACHE.items():
+            args_mod._FILE_ARGS_CACHE[key] = ([("--tags", str, [], "")], file_args)
+
+    reads: list[str] = []
+    real_read = args_mod._read_args_from_file
+    monkeypatch.setattr(
+        args_mod,
+        "_read_args_from_file",
+        lambda **kwargs: reads.append(kwargs["path"]) or real_read(**kwargs),
+    )
+    assert get_args_from_file(str(path), template)[0]["tags"] == ["a"]
+    assert reads == [str(path)]
+
+
+def test_delete_args_from_string_keeps_remaining_text_as_written():
+    line = '  - [ ] a  "b c"   --x=1   d\n'
+    assert delete_args_from_string(line, ["--x"]) == '  - [ ] a  "b c"   d\n'
+
+
+def test_get_args_from_file_reuses_unchanged_line_parses(tmp_path: Path, monkeypatch):
+    path = tmp_path / "note.md"
+    path.write_text("--tags a b\nbody\n", encoding="utf-8")
+    template = [
+        ("--tags", str, [], ""),
+        ("--name", str, None, ""),
+    ]
+    calls: list[list[str]] = []
+    real_parse_args = args_mod.parse_args
+
+    def counting_parse_args(args, template):
+        calls.append(args)
+        return real_parse_args(args=args, template=template)
+
+    monkeypatch.setattr(args_mod, "parse_args", counting_parse_args)
+
+    assert get_args_from_file(str(path), template)[0]["tags"] == ["a", "b"]
+    path.write_text("--tags a b\nbody\n--name n --tags c\n", encoding="utf-8")
+    known, _unknown, _arg_lines = get_args_from_file(str(path), template)
+
+    assert known == {"tags": ["a", "b", "c"], "name": "n"}
+    assert calls == [["--tags", "a", "b"], ["--name", "n", "--tags", "c"]]
+    assert get_args_from_file(str(path), template, force_reload=True)[0]["tags"] == ["a", "b", "c"]
+
+
+def test_get_args_from_file_decodes_only_lines_that_may_hold_flags(tmp_path: Path):
+    path = tmp_path / "note.md"
+    path.write_bytes(b"caf\xe9 prose\r\n--tags a\r\n")
+    template = [
+        ("--tags", str, [], ""),
+    ]
+
+    known, _unknown, arg_lines = get_args_from_file(str(path), template)
+    assert known == {"tags": ["a"]}
+    assert arg_lines["tags"] == [2]
+
+
+def test_get_args_from_file_keeps_flags_when_another_line_has_nul(tmp_path: Path):
+    path = tmp_path / "note.md"
+    path.write_bytes(b"a\0b\n--name kept\n")
+
+    known, _unknown, _lines = get_args_from_file(str(path), (("--name", str, None, ""),))
+
+    assert known["name"] == "kept"
+
+
+def test_delete_args_leaves_lines_without_the_flag_untouched():
+    assert delete_args_from_string("  keep 'a b'  \n", ["--c"]) == "  keep 'a b'\n"
+    assert delete_args_from_string("--cc x --c y\n", ("--c",)) == "--cc x\n"
+    assert delete_args_from_string("   \n", ["--c"]) == "\n"
+
+
+def test_get_args_from_file_ends_lines_on_cr_crlf_and_lf(tmp_path: Path):
+    path = tmp_path / "note.md"
+    path.write_bytes(b"--tags a\r--tags b\r\ntext\n--tags c\r")
+    template = [
+        ("--tags", str, [], ""),
+    ]
+
+    known, _unknown, arg_lines = get_args_from_file(str(path), template)
+    assert known["tags"] == ["a", "b", "c"]
+    assert arg_lines["tags"] == [1, 2, 4]
+
+    known, _unknown, _arg_lines = get_args_from_file(str(path), template, only_first_line=True)
+    assert known["tags"] == ["a"]
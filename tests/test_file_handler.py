@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import cast
 
-from watchdog.events import FileModifiedEvent, FileMovedEvent, FileOpenedEvent, FileSystemEvent
+from watchdog.events import FileCreatedEvent, FileModifiedEvent, FileMovedEvent, FileOpenedEvent, FileSystemEvent
 
-from lucy_notes_manager.file_handler import FileHandler
+from lucy_notes_manager.file_handler import DebouncedDispatcher, FileHandler
 from lucy_notes_manager.module_manager import ModuleManager
 
 
@@ -169,3 +170,202 @@ def test_ignore_path_is_normalized_before_matching_event_path(tmp_path: Path) ->
     handler.on_modified(_modified_event(str(file_path.resolve())))
 
     assert modules.calls == 1
+
+
+def test_abs_follows_a_re_pointed_directory_symlink(tmp_path: Path) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    link = tmp_path / "current"
+    link.symlink_to(tmp_path / "a")
+    handler = _mk_handler(_DummyModules(ignore_map=None))
+
+    assert handler._abs(str(link / "note.md")) == str((tmp_path / "a" / "note.md").resolve())
+
+    link.unlink()
+    link.symlink_to(tmp_path / "b")
+    assert handler._abs(str(link / "note.md")) == str((tmp_path / "b" / "note.md").resolve())
+
+
+def test_debounced_burst_runs_modules_once_and_prefers_moved(tmp_path: Path) -> None:
+    src = tmp_path / "old.md"
+    dst = tmp_path / "new.md"
+    dst.write_text("x\n", encoding="utf-8")
+
+    modules = _SequenceModules(ignore_maps=[None])
+    handler = FileHandler(
+        modules=cast(ModuleManager, modules),
+        open_cooldown_seconds=20,
+        debounce_ms=60_000,
+    )
+
+    handler.on_moved(_moved_event(str(src), str(dst)))
+    handler.on_modified(_modified_event(str(dst)))
+    handler.on_modified(_modified_event(str(dst)))
+    assert modules.calls == 0
+
+    handler._dispatcher.flush()
+
+    assert modules.calls == 1
+    assert modules.paths == [str(dst.resolve())]
+
+
+def test_debounced_burst_consumes_one_ignore_mark_per_raw_event(tmp_path: Path) -> None:
+    file_path = tmp_path / "burst.md"
+    file_path.write_text("x\n", encoding="utf-8")
+
+    modules = _SequenceModules(ignore_maps=[{str(file_path): 2}, None])
+    handler = FileHandler(
+        modules=cast(ModuleManager, modules),
+        open_cooldown_seconds=20,
+        debounce_ms=60_000,
+    )
+    ev = _modified_event(str(file_path))
+
+    handler.on_modified(ev)
+    handler._dispatcher.flush()  # processed, sets ignore=2
+    handler.on_modified(ev)
+    handler.on_modified(ev)
+    handler._dispatcher.flush()  # both raw events were self-caused
+    assert modules.calls == 1
+
+    handler.on_modified(ev)
+    handler._dispatcher.flush()
+    assert modules.calls == 2
+
+
+def test_open_cache_cleanup_drops_least_recently_opened(tmp_path: Path, monkeypatch) -> None:
+    times = iter([0.0, 1.0, 2.0, 100.0])
+    monkeypatch.setattr(
+        "lucy_notes_manager.file_handler.time.monotonic",
+        lambda: next(times),
+    )
+
+    handler = _mk_handler(_DummyModules(ignore_map=None), cooldown=10)
+    handler._cleanup_remove_count = 2
+
+    handler._should_process_open(str(tmp_path / "a.md"))
+    handler._should_process_open(str(tmp_path / "b.md"))
+    handler._should_process_open(str(tmp_path / "c.md"))
+    handler._should_process_open(str(tmp_path / "a.md"))  # re-accepted, now newest
+
+    handler._cleanup_open_cache_oldest_n()
+
+    assert list(handler._last_open_ts) == [str((tmp_path / "a.md").resolve())]
+
+
+def test_write_during_created_run_is_processed(tmp_path: Path) -> None:
+    note = tmp_path / "new.md"
+    note.write_text("", encoding="utf-8")
+
+    class _WritingModules(_DummyModules):
+        def run(self, path: str, event: FileSystemEvent) -> dict[str, int] | None:
+            if self.calls == 0:
+                # the user fills the note in while modules handle its creation
+                note.write_text("--banner\n", encoding="utf-8")
+            return super().run(path, event)
+
+    modules = _WritingModules(ignore_map=None)
+    handler = _mk_handler(modules)
+
+    handler.on_created(FileCreatedEvent(str(note)))
+    handler.on_modified(_modified_event(str(note)))  # delivered right after the run
+
+    assert modules.calls == 2
+
+
+def test_dispatch_drops_git_events_before_open_cooldown(tmp_path: Path) -> None:
+    git_file = tmp_path / ".git" / "index"
+    git_file.parent.mkdir(parents=True)
+    git_file.write_text("x\n", encoding="utf-8")
+
+    modules = _DummyModules(ignore_map=None)
+    handler = _mk_handler(modules)
+
+    handler.dispatch(_opened_event(str(git_file)))
+    handler.dispatch(_modified_event(str(git_file)))
+
+    assert modules.calls == 0
+    assert handler._last_open_ts == {}
+
+
+def test_dispatch_filters_bytes_paths_and_decodes_the_rest(tmp_path: Path) -> None:
+    note = tmp_path / "a.md"
+    note.write_text("x\n", encoding="utf-8")
+    git_file = tmp_path / ".git" / "index"
+
+    modules = _DummyModules(ignore_map=None)
+    handler = _mk_handler(modules)
+
+    handler.dispatch(FileModifiedEvent(os.fsencode(str(git_file))))
+    handler.dispatch(FileModifiedEvent(os.fsencode(str(tmp_path / ".hidden.md"))))
+    handler.dispatch(FileModifiedEvent(os.fsencode(str(note))))
+
+    assert modules.paths == [str(note.resolve())]
+
+
+def test_dispatch_keeps_moves_out_of_git_dir(tmp_path: Path) -> None:
+    note = tmp_path / "restored.md"
+    note.write_text("x\n", encoding="utf-8")
+    git_file = tmp_path / ".git" / "tmp_obj"
+
+    modules = _DummyModules(ignore_map=None)
+    handler = _mk_handler(modules)
+
+    handler.dispatch(_moved_event(str(git_file), str(note)))
+    handler.dispatch(FileMovedEvent(os.fsencode(str(git_file)), os.fsencode(str(note))))
+    handler.dispatch(_moved_event(str(note), str(git_file)))
+
+    assert modules.paths == [str(note.resolve())] * 2
+
+
+def test_debounced_burst_keeps_created_over_later_modified(tmp_path: Path) -> None:
+    note = tmp_path / "m.md"
+    note.write_text("x\n", encoding="utf-8")
+
+    events: list[str] = []
+
+    class _RecordingModules:
+        def run(self, path: str, event: FileSystemEvent) -> None:
+            events.append(event.event_type)
+
+    handler = FileHandler(
+        modules=cast(ModuleManager, _RecordingModules()),
+        open_cooldown_seconds=0,
+        debounce_ms=60_000,
+    )
+
+    handler.on_created(FileCreatedEvent(str(note)))
+    handler.on_modified(_modified_event(str(note)))
+    handler._dispatcher.flush()
+
+    handler.on_modified(_modified_event(str(note)))
+    handler.on_opened(_opened_event(str(note)))
+    handler._dispatcher.flush()
+
+    assert events == ["created", "modified"]
+
+
+def test_shared_dispatcher_routes_each_path_to_its_own_handler(tmp_path: Path) -> None:
+    first_note = tmp_path / "a.md"
+    second_note = tmp_path / "b.md"
+    first_note.write_text("x\n", encoding="utf-8")
+    second_note.write_text("x\n", encoding="utf-8")
+
+    dispatcher = DebouncedDispatcher(debounce_seconds=60.0)
+    first_modules = _DummyModules(ignore_map=None)
+    second_modules = _DummyModules(ignore_map=None)
+    first = FileHandler(
+        modules=cast(ModuleManager, first_modules), open_cooldown_seconds=0, dispatcher=dispatcher
+    )
+    second = FileHandler(
+        modules=cast(ModuleManager, second_modules), open_cooldown_seconds=0, dispatcher=dispatcher
+    )
+
+    first.on_modified(_modified_event(str(first_note)))
+    second.on_modified(_modified_event(str(second_note)))
+    assert first_modules.calls == second_modules.calls == 0
+
+    dispatcher.flush()
+
+    assert first_modules.paths == [str(first_note.resolve())]
+    assert second_modules.paths == [str(second_note.resolve())]
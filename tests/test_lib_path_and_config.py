@@ -38,3 +38,43 @@ def test_find_parent_with_git_marker(tmp_path: Path) -> None:
 
     assert find_parent_with(str(nested), ".git") == str(repo.resolve())
     assert find_parent_with(str(tmp_path / "outside.txt"), ".git") is None
+
+
+def test_find_parent_with_sees_markers_created_after_a_lookup(tmp_path: Path) -> None:
+    outer = tmp_path / "notes"
+    repo = outer / "repo"
+    note = repo / "note.md"
+    repo.mkdir(parents=True)
+    note.write_text("x\n", encoding="utf-8")
+
+    # a miss is not remembered
+    assert find_parent_with(str(note), ".git") is None
+    (outer / ".git").mkdir()
+    assert find_parent_with(str(note), ".git") == str(outer)
+
+    # a hit does not hide a marker created closer to the path
+    (repo / ".git").mkdir()
+    assert find_parent_with(str(note), ".git") == str(repo)
+
+    (repo / ".git").rmdir()
+    assert find_parent_with(str(note), ".git") == str(outer)
+
+
+def test_find_parent_with_accepts_git_file_of_a_worktree(tmp_path: Path) -> None:
+    worktree = tmp_path / "worktree"
+    (worktree / "docs").mkdir(parents=True)
+    (worktree / ".git").write_text("gitdir: /elsewhere/.git/worktrees/w\n", encoding="utf-8")
+
+    assert find_parent_with(str(worktree / "docs" / "note.md"), ".git") == str(worktree)
+
+
+def test_find_parent_with_sees_git_file_created_after_a_lookup(tmp_path: Path) -> None:
+    worktree = tmp_path / "worktree"
+    note = worktree / "note.md"
+    worktree.mkdir()
+    note.write_text("x\n", encoding="utf-8")
+
+    assert find_parent_with(str(note), ".git") is None
+    # `git worktree add` writes a .git file, not a directory
+    (worktree / ".git").write_text("gitdir: /elsewhere/.git/worktrees/w\n", encoding="utf-8")
+    assert find_parent_with(str(note), ".git") == str(worktree)
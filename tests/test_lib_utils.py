@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import mmap
+import os
 from pathlib import Path
 
 import lucy_notes_manager.lib as lib_mod
@@ -32,6 +34,7 @@ def test_notify_uses_global_notifypy_object(monkeypatch):
 
     dummy = DummyNotify()
     monkeypatch.setattr(lib_mod, "notifypy", dummy)
+    monkeypatch.setattr(lib_mod, "_dbus_notify", lambda message, title: False)
 
     lib_mod.notify("hello", title="T")
 
@@ -40,6 +43,63 @@ def test_notify_uses_global_notifypy_object(monkeypatch):
     assert dummy.sent is True
 
 
+def test_notify_prefers_dbus_and_skips_notifypy(monkeypatch):
+    class DummyNotify:
+        sent = False
+
+        def send(self):
+            self.sent = True
+
+    dummy = DummyNotify()
+    sent: list[tuple[str, str]] = []
+    monkeypatch.setattr(lib_mod, "notifypy", dummy)
+    monkeypatch.setattr(
+        lib_mod,
+        "_dbus_notify",
+        lambda message, title: sent.append((title, message)) or True,
+    )
+
+    lib_mod.notify("hello", title="T")
+
+    assert sent == [("T", "hello")]
+    assert dummy.sent is False
+
+
+def test_dbus_notify_retries_connect_after_backoff(monkeypatch):
+    class DummyConnection:
+        def __init__(self):
+            self.sent = 0
+
+        def send_and_get_reply(self, _msg, timeout):
+            self.sent += 1
+
+    connection = DummyConnection()
+    attempts: list[str] = []
+
+    def open_connection(bus):
+        attempts.append(bus)
+        if len(attempts) == 1:
+            raise ConnectionError("no session bus yet")
+        return connection
+
+    now = [100.0]
+    monkeypatch.setattr(lib_mod, "open_dbus_connection", open_connection)
+    monkeypatch.setattr(lib_mod, "new_method_call", lambda *_args: object(), raising=False)
+    monkeypatch.setattr(lib_mod.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(lib_mod, "_dbus_connection", None)
+    monkeypatch.setattr(lib_mod, "_dbus_retry_at", 0.0)
+
+    assert lib_mod._dbus_notify("m", "t") is False
+    now[0] += lib_mod._DBUS_RETRY_SEC - 1
+    assert lib_mod._dbus_notify("m", "t") is False
+    assert len(attempts) == 1
+
+    now[0] += 1
+    assert lib_mod._dbus_notify("m", "t") is True
+    assert len(attempts) == 2
+    assert connection.sent == 1
+
+
 def test_slow_write_lines_from_writes_and_counts(tmp_path: Path, monkeypatch):
     path = tmp_path / "note.txt"
     monkeypatch.setattr(lib_mod.time, "sleep", lambda _d: None)
@@ -53,3 +113,65 @@ def test_slow_write_lines_from_writes_and_counts(tmp_path: Path, monkeypatch):
 
     assert path.read_text(encoding="utf-8") == "a\nb\nc\n"
     assert result == {str(path.resolve()): 2}
+
+
+def test_line_span_clamps_like_readlines_indexing(tmp_path: Path):
+    path = tmp_path / "note.md"
+    path.write_bytes(b"a\nbb\nccc")
+
+    with open(path, "rb") as f, lib_mod.mapped_file(f) as buf:
+        assert lib_mod.line_span(buf, 0) == (0, 2)
+        assert lib_mod.line_span(buf, 2) == (2, 5)
+        assert lib_mod.line_span(buf, 3) == (5, 8)
+        assert lib_mod.line_span(buf, 9) == (5, 8)
+
+    assert lib_mod.line_span(b"a\nb\n", 5) == (2, 4)
+    assert lib_mod.line_span(b"", 1) == (0, 0)
+    assert lib_mod.line_span(b"a\rbb\r\nccc", 2) == (2, 6)
+    assert lib_mod.line_span(b"a\rbb\r\nccc", 3) == (6, 9)
+
+
+def test_mapped_file_reads_small_files_and_maps_large_ones(tmp_path: Path, monkeypatch):
+    path = tmp_path / "note.md"
+    path.write_bytes(b"a\nbb\n")
+
+    with open(path, "rb") as f, lib_mod.mapped_file(f) as buf:
+        assert isinstance(buf, bytes)
+        assert buf == b"a\nbb\n"
+
+    monkeypatch.setattr(lib_mod, "_MMAP_MIN_BYTES", 1)
+    with open(path, "rb") as f, lib_mod.mapped_file(f) as buf:
+        assert isinstance(buf, mmap.mmap)
+        assert buf[:] == b"a\nbb\n"
+
+
+def test_replace_span_small_and_kernel_copied_tails(tmp_path: Path, monkeypatch):
+    path = tmp_path / "note.md"
+    head, tail = b"head\n", b"".join(b"line %d\n" % i for i in range(50))
+
+    for threshold in (1 << 30, 1):  # python rewrite, then sendfile
+        monkeypatch.setattr(lib_mod, "_KERNEL_COPY_MIN_BYTES", threshold)
+        path.write_bytes(head + b"--banner X\n" + tail)
+
+        with open(path, "r+b") as f:
+            lib_mod.replace_span(f, len(head), len(head) + 11, b"BANNER\nBANNER\n")
+
+        assert path.read_bytes() == head + b"BANNER\nBANNER\n" + tail
+
+
+def test_replace_span_finishes_a_short_vectored_write(tmp_path: Path, monkeypatch):
+    path = tmp_path / "note.md"
+    path.write_bytes(b"a\n--banner X\nlong tail line\n")
+
+    real_pwritev = os.pwritev
+
+    def short_pwritev(fd, chunks, offset):
+        # pretend the kernel stopped after 3 bytes
+        return real_pwritev(fd, [b"".join(chunks)[:3]], offset)
+
+    monkeypatch.setattr(os, "pwritev", short_pwritev)
+
+    with open(path, "r+b") as f:
+        lib_mod.replace_span(f, 2, 13, b"B\n")
+
+    assert path.read_bytes() == b"a\nB\nlong tail line\n"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import runpy
 import time
 from dataclasses import dataclass, field
@@ -23,6 +24,7 @@ class _ObserverState:
     started: bool = False
     stopped: bool = False
     joined: bool = False
+    flushed: int = 0
 
 
 def test_main_schedules_observer_and_stops_cleanly(tmp_path: Path, monkeypatch):
@@ -42,9 +44,18 @@ def test_main_schedules_observer_and_stops_cleanly(tmp_path: Path, monkeypatch):
             state.joined = True
 
     class FakeFileHandler:
-        def __init__(self, modules, open_cooldown_seconds):
+        def __init__(self, modules, open_cooldown_seconds, debounce_ms=0, dispatcher=None):
             self.modules = modules
             self.open_cooldown_seconds = open_cooldown_seconds
+            self.debounce_ms = debounce_ms
+            self.dispatcher = dispatcher
+
+    class FakeDispatcher:
+        def __init__(self, debounce_seconds):
+            self.debounce_seconds = debounce_seconds
+
+        def flush(self):
+            state.flushed += 1
 
     class FakeModuleManager:
         def __init__(self, modules, args):
@@ -53,6 +64,7 @@ def test_main_schedules_observer_and_stops_cleanly(tmp_path: Path, monkeypatch):
 
     monkeypatch.setattr(observers_mod, "Observer", FakeObserver)
     monkeypatch.setattr(file_handler_mod, "FileHandler", FakeFileHandler)
+    monkeypatch.setattr(file_handler_mod, "DebouncedDispatcher", FakeDispatcher)
     monkeypatch.setattr(module_manager_mod, "ModuleManager", FakeModuleManager)
     monkeypatch.setattr(
         args_mod,
@@ -61,8 +73,9 @@ def test_main_schedules_observer_and_stops_cleanly(tmp_path: Path, monkeypatch):
             {
                 "sys_debug": False,
                 "sys_logging_format": "%(message)s",
-                "sys_notes_dirs": [str(tmp_path)],
+                "sys_notes_dirs": [str(tmp_path), str(tmp_path / "work")],
                 "sys_on_open_cooldown": 20,
+                "sys_debounce_ms": 150,
                 "sys_enable_experimental_modules": False,
             },
             [],
@@ -75,8 +88,14 @@ def test_main_schedules_observer_and_stops_cleanly(tmp_path: Path, monkeypatch):
     assert state.started is True
     assert state.stopped is True
     assert state.joined is True
-    assert len(state.scheduled) == 1
-    assert state.scheduled[0][1] == str(tmp_path)
+    assert len(state.scheduled) == 2
+    assert state.scheduled[0][1] == os.fsencode(str(tmp_path))
+    # one dispatcher shared by every notes dir, flushed on shutdown
+    shared = state.scheduled[0][0].dispatcher
+    assert isinstance(shared, FakeDispatcher)
+    assert shared.debounce_seconds == 0.15
+    assert state.scheduled[1][0].dispatcher is shared
+    assert state.flushed == 1
     assert state.scheduled[0][2] is True
     assert [m.name for m in state.scheduled[0][0].modules.modules] == [
         "banner",
@@ -97,6 +116,7 @@ def test_main_raises_when_notes_dirs_are_missing(monkeypatch):
                 "sys_logging_format": "%(message)s",
                 "sys_notes_dirs": None,
                 "sys_on_open_cooldown": 20,
+                "sys_debounce_ms": 150,
                 "sys_enable_experimental_modules": False,
             },
             [],
@@ -126,9 +146,11 @@ def test_main_enables_experimental_modules_when_flag_is_true(
             state.joined = True
 
     class FakeFileHandler:
-        def __init__(self, modules, open_cooldown_seconds):
+        def __init__(self, modules, open_cooldown_seconds, debounce_ms=0, dispatcher=None):
             self.modules = modules
             self.open_cooldown_seconds = open_cooldown_seconds
+            self.debounce_ms = debounce_ms
+            self.dispatcher = dispatcher
 
     class FakeModuleManager:
         def __init__(self, modules, args):
@@ -147,6 +169,7 @@ def test_main_enables_experimental_modules_when_flag_is_true(
                 "sys_logging_format": "%(message)s",
                 "sys_notes_dirs": [str(tmp_path)],
                 "sys_on_open_cooldown": 20,
+                "sys_debounce_ms": 150,
                 "sys_enable_experimental_modules": True,
             },
             [],
@@ -3,8 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 
 import pytest
-from watchdog.events import FileModifiedEvent
+from watchdog.events import FileDeletedEvent, FileModifiedEvent
 
+import lucy_notes_manager.module_manager as module_manager_mod
 from lucy_notes_manager.module_manager import ModuleManager
 from lucy_notes_manager.modules.abstract_module import AbstractModule, Context, System
 
@@ -78,3 +79,33 @@ def test_run_respects_exclude_and_force_and_event_implementation(tmp_path: Path)
     assert a2.calls == 1
     assert c2.calls == 1
     assert ignore_paths_force == {str(note.resolve()): 3}
+
+
+class _ModDeleted(AbstractModule):
+    name = "del"
+    priority = 10
+
+    def __init__(self):
+        self.contexts: list[Context] = []
+
+    def deleted(self, ctx: Context, system: System):
+        self.contexts.append(ctx)
+        return None
+
+
+def test_run_skips_reading_args_when_nothing_handles_it(tmp_path: Path, monkeypatch):
+    reads: list[str] = []
+    monkeypatch.setattr(
+        module_manager_mod,
+        "get_args_from_file",
+        lambda path, **_kwargs: reads.append(path) or ({}, [], {}),
+    )
+    module = _ModDeleted()
+    manager = ModuleManager(modules=[_ModA(), module], args=["--exclude", "a"])
+    gone = str(tmp_path / "gone.md")
+
+    assert manager.run(gone, FileModifiedEvent(gone)) is None
+    assert manager.run(gone, FileDeletedEvent(gone)) is None
+
+    assert reads == []
+    assert [ctx.config for ctx in module.contexts] == [manager.config]